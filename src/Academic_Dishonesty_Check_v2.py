@@ -18,10 +18,12 @@ import sys
 import json
 import platform
 import statistics
+from bisect import bisect_left
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from html import unescape
 
@@ -114,6 +116,11 @@ VERSION_DATE = "2025-12-26"
 CANVAS_BASE_URL = os.getenv("CANVAS_BASE_URL")
 API_TOKEN = os.getenv("CANVAS_API_TOKEN")
 
+# Longest submission body analyzed, in characters. Real essays are far below
+# this; bodies past it are almost always inline base64 images pasted into the
+# rich-text editor, which every per-character pass would otherwise crawl.
+MAX_BODY_CHARS = 1_000_000
+
 # Try to import requests
 try:
     import requests
@@ -121,6 +128,14 @@ try:
 except ImportError:
     HAS_REQUESTS = False
 
+# Optional: orjson parses large Canvas pages (full HTML bodies) several times
+# faster than the stdlib json used by response.json()
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 HEADERS = {}
 if API_TOKEN and HAS_REQUESTS:
     HEADERS = {
@@ -128,6 +143,10 @@ if API_TOKEN and HAS_REQUESTS:
         "Content-Type": "application/json"
     }
 
+# One pooled session for all Canvas calls so pages and attachments reuse
+# the same keep-alive connection instead of a fresh TCP/TLS handshake each.
+_SESSION = requests.Session() if HAS_REQUESTS else None
+
 
 def get_config_dir() -> Path:
     """Get the configuration directory for storing settings."""
@@ -195,6 +214,10 @@ _ZERO_WIDTH_CHARS = re.compile(
     ']'
 )
 
+# Tag and whitespace patterns applied to every submission in _clean_text
+_HTML_TAG = re.compile(r'<[^>]+>')
+_WHITESPACE_RUN = re.compile(r'\s+')
+
 
 def _detect_unicode_manipulation(text: str) -> Tuple[int, List[str]]:
     """Detect zero-width / invisible characters BEFORE stripping them.
@@ -310,6 +333,18 @@ INFLATED_VOCAB = [
     ("multifaceted", "complex"), ("plethora", "many")
 ]
 
+# (phrase, lowercased needle) pairs, lowercased once here instead of for
+# every phrase on every submission
+_COGNITIVE_DIVERSITY_NEEDLES = [(p, p.lower()) for p in COGNITIVE_DIVERSITY_MARKERS]
+_AI_TRANSITION_NEEDLES = [(p, p.lower()) for p in AI_TRANSITIONS]
+_GENERIC_PHRASE_NEEDLES = [(p, p.lower()) for p in GENERIC_PHRASES]
+_INFLATED_VOCAB_NEEDLES = [(w, w.lower()) for w, _ in INFLATED_VOCAB]
+_EMOTIONAL_NEEDLES = [(p, p.lower()) for p in EMOTIONAL_MARKERS]
+
+# Compiled once here rather than looked up in re's cache on every submission
+_PERSONAL_MARKER_PATTERNS = [re.compile(p, re.IGNORECASE) for p in PERSONAL_MARKERS]
+_PROPER_NOUN = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
 
 # =============================================================================
 # ASSIGNMENT PROFILES
@@ -616,6 +651,11 @@ class DishonestyAnalyzer:
                         self._marker_weights.get('generic_phrases', 0.4) * w_ai
                     )
 
+        # Stateless per-text helpers: build once per analyzer rather than once
+        # per submission inside analyze_text().
+        self._org_analyzer = OrganizationalAnalyzer() if HAS_ORG_ANALYZER else None
+        self._context_analyzer = ContextAnalyzer() if HAS_CONTEXT_ANALYZER else None
+
     def analyze_text(self,
                      text: str,
                      student_id: str = "unknown",
@@ -681,7 +721,7 @@ class DishonestyAnalyzer:
 
         # Analyze with built-in patterns
         suspicious_score, authenticity_score, marker_counts, markers_found, \
-            cognitive_protection_multiplier = self._analyze_with_builtin_patterns(text)
+            cognitive_protection_multiplier = self._analyze_with_builtin_patterns(text, word_count)
         # Save pattern-only suspicious for convergence channel check (Phase 2)
         pattern_suspicious = suspicious_score
 
@@ -698,8 +738,7 @@ class DishonestyAnalyzer:
 
         if HAS_ORG_ANALYZER:
             try:
-                org_analyzer = OrganizationalAnalyzer()
-                org_analysis = org_analyzer.analyze(text)
+                org_analysis = self._org_analyzer.analyze(text, word_count)
                 ai_org_score = org_analysis.total_ai_organizational_score
 
                 # Add to suspicious score (scaled by ai_specific_org weight)
@@ -779,7 +818,8 @@ class DishonestyAnalyzer:
                 # Analyze with configured weights
                 human_presence_result = hp_detector.analyze(
                     text,
-                    assignment_type=self.assignment_type or self.profile_id
+                    assignment_type=self.assignment_type or self.profile_id,
+                    word_count=word_count
                 )
                 human_confidence = human_presence_result.confidence_percentage
                 human_level = human_presence_result.confidence_level
@@ -794,8 +834,7 @@ class DishonestyAnalyzer:
         esl_notes = []  # accumulated here, merged into context_applied later
         if HAS_CONTEXT_ANALYZER:
             try:
-                context_analyzer = ContextAnalyzer()
-                context_result = context_analyzer.analyze_context(text)
+                context_result = self._context_analyzer.analyze_context(text)
 
                 # If ESL error patterns detected, reduce suspicious score
                 if context_result.context.has_esl_error_patterns:
@@ -1350,14 +1389,14 @@ class DishonestyAnalyzer:
         text = unescape(text)
         
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', text)
+        text = _HTML_TAG.sub(' ', text)
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RUN.sub(' ', text)
         
         return text.strip()
     
-    def _analyze_with_builtin_patterns(self, text: str) -> Tuple[float, float, Dict[str, int], Dict[str, List[str]]]:
+    def _analyze_with_builtin_patterns(self, text: str, word_count: int) -> Tuple[float, float, Dict[str, int], Dict[str, List[str]]]:
         """
         Analyze text using built-in patterns.
 
@@ -1374,8 +1413,8 @@ class DishonestyAnalyzer:
 
         # FIRST: Check for cognitive diversity markers (protective indicators)
         cognitive_matches = []
-        for phrase in COGNITIVE_DIVERSITY_MARKERS:
-            count = text_lower.count(phrase.lower())
+        for phrase, needle in _COGNITIVE_DIVERSITY_NEEDLES:
+            count = text_lower.count(needle)
             if count > 0:
                 cognitive_matches.extend([phrase] * count)
         marker_counts['cognitive_diversity'] = len(cognitive_matches)
@@ -1399,8 +1438,8 @@ class DishonestyAnalyzer:
         # Check AI transitions (ORGANIZATIONAL BIAS - subject to protection)
         # Notes mode: smooth transitions are EXTRA suspicious (amplified 2×)
         transition_matches = []
-        for phrase in AI_TRANSITIONS:
-            count = text_lower.count(phrase.lower())
+        for phrase, needle in _AI_TRANSITION_NEEDLES:
+            count = text_lower.count(needle)
             if count > 0:
                 transition_matches.extend([phrase] * count)
         marker_counts['ai_transitions'] = len(transition_matches)
@@ -1411,14 +1450,14 @@ class DishonestyAnalyzer:
 
         # Clustering bonus: multiple AI markers in short text is very suspicious
         # Also subject to cognitive protection
-        if len(transition_matches) >= 3 and len(text.split()) < 500:
+        if len(transition_matches) >= 3 and word_count < 500:
             suspicious_score += 2.0 * cognitive_protection_multiplier
 
         # Check generic phrases (ORGANIZATIONAL BIAS - subject to protection)
         # Notes mode: generic essay-summary phrases are EXTRA suspicious (amplified 2×)
         generic_matches = []
-        for phrase in GENERIC_PHRASES:
-            count = text_lower.count(phrase.lower())
+        for phrase, needle in _GENERIC_PHRASE_NEEDLES:
+            count = text_lower.count(needle)
             if count > 0:
                 generic_matches.extend([phrase] * count)
         marker_counts['generic_phrases'] = len(generic_matches)
@@ -1429,8 +1468,8 @@ class DishonestyAnalyzer:
 
         # Check inflated vocabulary (ORGANIZATIONAL BIAS - subject to protection)
         inflated_matches = []
-        for inflated, simple in INFLATED_VOCAB:
-            count = text_lower.count(inflated.lower())
+        for inflated, needle in _INFLATED_VOCAB_NEEDLES:
+            count = text_lower.count(needle)
             if count > 0:
                 inflated_matches.extend([inflated] * count)
         marker_counts['inflated_vocabulary'] = len(inflated_matches)
@@ -1443,11 +1482,12 @@ class DishonestyAnalyzer:
         # personal_voice_authentic=False: notes/essays where first-person ≠ authenticity signal
         personal_count = 0
         personal_matches = []
-        for pattern in PERSONAL_MARKERS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            personal_count += len(matches)
-            if matches:
-                personal_matches.extend([m.strip() for m in matches[:3]])
+        for pattern in _PERSONAL_MARKER_PATTERNS:
+            # Count lazily; only the first three hits are kept as examples
+            for i, match in enumerate(pattern.finditer(text)):
+                if i < 3:
+                    personal_matches.append(match.group().strip())
+                personal_count += 1
         marker_counts['personal_voice'] = personal_count
         if personal_matches:
             markers_found['personal_voice'] = personal_matches[:5]
@@ -1457,8 +1497,8 @@ class DishonestyAnalyzer:
         # Check emotional markers (presence is GOOD — unless personal_voice_authentic=False)
         emotional_count = 0
         emotional_matches = []
-        for phrase in EMOTIONAL_MARKERS:
-            count = text_lower.count(phrase.lower())
+        for phrase, needle in _EMOTIONAL_NEEDLES:
+            count = text_lower.count(needle)
             emotional_count += count
             if count > 0:
                 emotional_matches.append(phrase)
@@ -1469,7 +1509,7 @@ class DishonestyAnalyzer:
             authenticity_score += min(emotional_count * self._marker_weights.get('emotional_language', 0.8), 4.0)
 
         # Check for specific details (proper nouns are GOOD)
-        proper_nouns = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', text)
+        proper_nouns = _PROPER_NOUN.findall(text)
         # Filter out sentence starters
         specific_count = len([n for n in proper_nouns if len(n) > 3])
         marker_counts['specific_details'] = specific_count
@@ -1741,17 +1781,19 @@ class PeerComparisonAnalyzer:
         
         # Calculate percentile threshold
         sorted_sus = sorted(suspicious_scores)
+        sorted_auth = sorted(authenticity_scores)
         threshold_idx = int(len(sorted_sus) * self.outlier_percentile / 100)
         sus_threshold = sorted_sus[min(threshold_idx, len(sorted_sus) - 1)]
         
         # Update each result with percentile and outlier info
         outliers = []
         for result in results:
-            # Calculate percentile
-            below_count = sum(1 for s in suspicious_scores if s < result.suspicious_score)
+            # Calculate percentile (bisect_left on the sorted column counts
+            # the peers scoring strictly lower)
+            below_count = bisect_left(sorted_sus, result.suspicious_score)
             result.suspicious_percentile = round(100 * below_count / len(suspicious_scores), 1)
             
-            below_count = sum(1 for s in authenticity_scores if s < result.authenticity_score)
+            below_count = bisect_left(sorted_auth, result.authenticity_score)
             result.authenticity_percentile = round(100 * below_count / len(authenticity_scores), 1)
             
             # Check if outlier
@@ -1880,12 +1922,18 @@ RECOMMENDED APPROACH:
         lines.append("SUMMARY BY CONCERN LEVEL")
         lines.append("-" * 75)
         
-        high_concern = [r for r in results if r.concern_level == 'high']
-        elevated = [r for r in results if r.concern_level == 'elevated']
-        moderate = [r for r in results if r.concern_level == 'moderate']
-        low = [r for r in results if r.concern_level == 'low']
-        clean = [r for r in results if r.concern_level == 'none']
-        smoking_guns = [r for r in results if r.smoking_gun]
+        # Bucket results by concern level in a single pass
+        by_level: Dict[str, List[AnalysisResult]] = {}
+        smoking_guns = []
+        for r in results:
+            by_level.setdefault(r.concern_level, []).append(r)
+            if r.smoking_gun:
+                smoking_guns.append(r)
+        high_concern = by_level.get('high', [])
+        elevated = by_level.get('elevated', [])
+        moderate = by_level.get('moderate', [])
+        low = by_level.get('low', [])
+        clean = by_level.get('none', [])
 
         if smoking_guns:
             lines.append(f"  !! SMOKING GUNS:  {len(smoking_guns):3d} (raw chatbot paste artifacts detected!)")
@@ -2019,6 +2067,25 @@ RECOMMENDED APPROACH:
 # CANVAS INTEGRATION
 # =============================================================================
 
+def _decode_json(response) -> Any:
+    """Decode a Canvas response body, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _get_paginated(url: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+    """Fetch every page of a Canvas list endpoint by following Link: rel="next"."""
+    items = []
+    while url:
+        response = _SESSION.get(url, headers=HEADERS, params=params)
+        response.raise_for_status()
+        items.extend(_decode_json(response))
+        url = response.links.get("next", {}).get("url")
+        params = None  # next URL already carries the query string
+    return items
+
+
 def get_courses():
     """Fetch list of courses for the current user."""
     if not HAS_REQUESTS or not API_TOKEN:
@@ -2029,9 +2096,7 @@ def get_courses():
     params = {"enrollment_state": "active", "per_page": 100}
     
     try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        return response.json()
+        return _get_paginated(url, params)
     except Exception as e:
         print(f"Error fetching courses: {e}")
         return []
@@ -2046,9 +2111,7 @@ def get_assignments(course_id: int):
     params = {"per_page": 100}
     
     try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        return response.json()
+        return _get_paginated(url, params)
     except Exception as e:
         print(f"Error fetching assignments: {e}")
         return []
@@ -2066,7 +2129,7 @@ def _extract_attachment_text(attachment: Dict[str, Any]) -> str:
     filename = (attachment.get("filename") or "").lower()
     content_type = (attachment.get("content-type") or "").lower()
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=60)
+        resp = _SESSION.get(url, headers=HEADERS, timeout=60)
         resp.raise_for_status()
         data = resp.content
 
@@ -2106,11 +2169,9 @@ def _extract_attachment_text(attachment: Dict[str, Any]) -> str:
             from odf.text import P
             from odf import teletype
             doc = odf_load(io.BytesIO(data))
-            return "\n".join(
-                teletype.extractText(p)
-                for p in doc.getElementsByType(P)
-                if teletype.extractText(p).strip()
-            )
+            # Extract each paragraph once, then drop the blank ones
+            paragraphs = (teletype.extractText(p) for p in doc.getElementsByType(P))
+            return "\n".join(t for t in paragraphs if t.strip())
 
         # PDF — extract raw text
         if filename.endswith(".pdf") or content_type.startswith("application/pdf"):
@@ -2130,6 +2191,14 @@ def _extract_attachment_text(attachment: Dict[str, Any]) -> str:
     return ""
 
 
+def _extract_submission_attachments(submission: Dict[str, Any]) -> str:
+    """Concatenate the extracted text of every attachment on a submission."""
+    text = ""
+    for att in (submission.get("attachments") or ()):
+        text += "\n" + _extract_attachment_text(att)
+    return text.strip()
+
+
 def _get_discussion_submissions(course_id: int, assignment_id: int):
     """Fetch discussion entries as pseudo-submissions for AIC analysis.
 
@@ -2147,9 +2216,9 @@ def _get_discussion_submissions(course_id: int, assignment_id: int):
     # ── Fetch assignment metadata to check submission_types ──────────
     try:
         url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}"
-        resp = requests.get(url, headers=HEADERS, timeout=30)
+        resp = _SESSION.get(url, headers=HEADERS, timeout=30)
         resp.raise_for_status()
-        assignment = resp.json()
+        assignment = _decode_json(resp)
     except Exception:
         return None
 
@@ -2169,9 +2238,9 @@ def _get_discussion_submissions(course_id: int, assignment_id: int):
     try:
         view_url = (f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}"
                     f"/discussion_topics/{topic_id}/view")
-        resp = requests.get(view_url, headers=HEADERS, timeout=30)
+        resp = _SESSION.get(view_url, headers=HEADERS, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
+        data = _decode_json(resp)
     except Exception:
         return None
 
@@ -2184,7 +2253,9 @@ def _get_discussion_submissions(course_id: int, assignment_id: int):
         msg = entry.get("message") or ""
         if uid and msg.strip():
             user_texts[uid].append(msg)
-        for reply in entry.get("replies", []):
+        # Most entries are leaves; iterate a shared empty tuple rather than
+        # allocating a fresh [] default for each one.
+        for reply in entry.get("replies") or ():
             _collect(reply)
 
     for entry in raw_entries:
@@ -2218,25 +2289,8 @@ def get_submissions(course_id: int, assignment_id: int):
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions"
     params = {"per_page": 100, "include[]": ["user"]}
     
-    all_submissions = []
-    
     try:
-        while url:
-            response = requests.get(url, headers=HEADERS, params=params)
-            response.raise_for_status()
-            submissions = response.json()
-            all_submissions.extend(submissions)
-            
-            # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip().strip("<>")
-                    params = {}  # URL already contains params
-                    break
-        
-        return all_submissions
+        return _get_paginated(url, params)
     except Exception as e:
         print(f"Error fetching submissions: {e}")
         return []
@@ -2301,12 +2355,29 @@ def analyze_assignment(course_id: int,
         aic_config=aic_config,
     )
     
+    # Attachment downloads are network-bound, so fetch them for every
+    # body-less submission concurrently before the (CPU-bound) analysis pass.
+    attachment_text: Dict[int, str] = {}
+    needs_download = [
+        i for i, sub in enumerate(submissions)
+        if sub.get("workflow_state", "") not in ("unsubmitted", "deleted")
+        and not (sub.get("body") or "").strip()
+        and sub.get("attachments")
+    ]
+    if needs_download:
+        with ThreadPoolExecutor(max_workers=min(8, len(needs_download))) as pool:
+            attachment_text = dict(zip(
+                needs_download,
+                pool.map(_extract_submission_attachments,
+                         [submissions[i] for i in needs_download]),
+            ))
+
     # Analyze each submission
     results = []
     errors = []
     skipped_no_text = 0
     skipped_unsubmitted = 0
-    for sub in submissions:
+    for idx, sub in enumerate(submissions):
         try:
             # Get student info
             user = sub.get("user", {})
@@ -2322,15 +2393,18 @@ def analyze_assignment(course_id: int,
             # Get submission text — inline body first, then attached files
             body = sub.get("body", "") or ""
             if not body.strip():
-                for att in (sub.get("attachments") or []):
-                    body += "\n" + _extract_attachment_text(att)
-                body = body.strip()
+                body = attachment_text.get(idx, "")
 
             # Skip if still no text after extraction
             if not body.strip():
                 skipped_no_text += 1
                 continue
 
+            if len(body) > MAX_BODY_CHARS:
+                print(f"  ⚠️  {student_name}: body is {len(body):,} characters, "
+                      f"analyzing the first {MAX_BODY_CHARS:,}")
+                body = body[:MAX_BODY_CHARS]
+
             print(f"  Analyzing: {student_name}...")
             result = analyzer.analyze_text(body, student_id, student_name)
             results.append(result)
@@ -2357,28 +2431,35 @@ def analyze_assignment(course_id: int,
     )
     cohort_stats = peer_analyzer.analyze_cohort(results)
 
+    # Resolve the assignment name once for both the RunStore and the report
+    assignment_name = next(
+        (a.get("name", "Unknown Assignment") for a in get_assignments(course_id)
+         if a.get("id") == assignment_id),
+        "Unknown Assignment",
+    )
+
     # Save results to RunStore (SQLite) so they appear in the Prior Runs dashboard
     try:
         from automation.run_store import RunStore
         store = RunStore()
-        # Get assignment name for storage (reuse what we fetched for the report below)
-        _assignments = get_assignments(course_id)
-        _assignment_name = next(
-            (a.get("name", "Unknown") for a in _assignments if a.get("id") == assignment_id),
-            "Unknown Assignment",
-        )
         _course_name = course_name or f"Course {course_id}"
+        # Index submissions by student once instead of scanning the list per result
+        _subs_by_student: Dict[str, Dict] = {}
+        for s in submissions:
+            _subs_by_student.setdefault(str(s.get("user_id")), s)
         for result in results:
-            _sub = next((s for s in submissions if str(s.get("user_id")) == str(result.student_id)), {})
+            _sub = _subs_by_student.get(str(result.student_id), {})
             store.save_result(
                 result,
                 course_id=str(course_id),
                 course_name=_course_name,
                 assignment_id=str(assignment_id),
-                assignment_name=_assignment_name,
+                assignment_name=assignment_name,
                 submitted_at=_sub.get("submitted_at"),
                 context_profile=context_profile,
-                submission_body=(_sub.get("body") or "").strip(),
+                # Same cap as the analyzed text; oversized bodies are pasted
+                # images, not prose worth keeping
+                submission_body=(_sub.get("body") or "")[:MAX_BODY_CHARS].strip(),
             )
     except Exception as _e:
         print(f"  ⚠ RunStore save skipped: {_e}")
@@ -2485,14 +2566,6 @@ def analyze_assignment(course_id: int,
     # Generate report
     print("Generating report...")
 
-    # Get assignment name
-    assignments = get_assignments(course_id)
-    assignment_name = "Unknown Assignment"
-    for a in assignments:
-        if a.get("id") == assignment_id:
-            assignment_name = a.get("name", "Unknown Assignment")
-            break
-
     report_gen = ReportGenerator()
     profile_name = ASSIGNMENT_PROFILES.get(profile_id, {}).get("name", profile_id)
     report_path = report_gen.generate_report(
@@ -18,6 +18,7 @@ import sys
 import json
 import platform
 import statistics
+from bisect import bisect_left
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
@@ -89,6 +90,14 @@ try:
 except ImportError:
     HAS_REQUESTS = False
 
+# Optional: orjson parses large Canvas pages (full HTML bodies) several times
+# faster than the stdlib json used by response.json()
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 HEADERS = {}
 if API_TOKEN and HAS_REQUESTS:
     HEADERS = {
@@ -96,6 +105,10 @@ if API_TOKEN and HAS_REQUESTS:
         "Content-Type": "application/json"
     }
 
+# One pooled session for all Canvas calls so pages reuse the same
+# keep-alive connection instead of a fresh TCP/TLS handshake each.
+_SESSION = requests.Session() if HAS_REQUESTS else None
+
 
 def get_config_dir() -> Path:
     """Get the configuration directory for storing settings."""
@@ -216,6 +229,10 @@ INFLATED_VOCAB = [
     ("multifaceted", "complex"), ("plethora", "many")
 ]
 
+# Compiled once here rather than looked up in re's cache on every submission
+_PERSONAL_MARKER_PATTERNS = [re.compile(p, re.IGNORECASE) for p in PERSONAL_MARKERS]
+_PROPER_NOUN = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
 
 # =============================================================================
 # ASSIGNMENT PROFILES
@@ -441,7 +458,7 @@ class DishonestyAnalyzer:
         
         # Analyze with built-in patterns
         suspicious_score, authenticity_score, marker_counts, markers_found = \
-            self._analyze_with_builtin_patterns(text)
+            self._analyze_with_builtin_patterns(text, word_count)
 
         # Apply profile weight multipliers
         suspicious_score = self._apply_profile_weights(suspicious_score, marker_counts)
@@ -454,7 +471,7 @@ class DishonestyAnalyzer:
         if HAS_ORG_ANALYZER:
             try:
                 org_analyzer = OrganizationalAnalyzer()
-                org_analysis = org_analyzer.analyze(text)
+                org_analysis = org_analyzer.analyze(text, word_count)
                 ai_org_score = org_analysis.total_ai_organizational_score
 
                 # Add to suspicious score
@@ -638,7 +655,7 @@ class DishonestyAnalyzer:
         
         return text.strip()
     
-    def _analyze_with_builtin_patterns(self, text: str) -> Tuple[float, float, Dict[str, int], Dict[str, List[str]]]:
+    def _analyze_with_builtin_patterns(self, text: str, word_count: int) -> Tuple[float, float, Dict[str, int], Dict[str, List[str]]]:
         """
         Analyze text using built-in patterns.
 
@@ -688,7 +705,7 @@ class DishonestyAnalyzer:
 
         # Clustering bonus: multiple AI markers in short text is very suspicious
         # Also subject to cognitive protection
-        if len(transition_matches) >= 3 and len(text.split()) < 500:
+        if len(transition_matches) >= 3 and word_count < 500:
             suspicious_score += 2.0 * cognitive_protection_multiplier
 
         # Check generic phrases (ORGANIZATIONAL BIAS - subject to protection)
@@ -718,11 +735,12 @@ class DishonestyAnalyzer:
         # Check personal markers (presence is GOOD)
         personal_count = 0
         personal_matches = []
-        for pattern in PERSONAL_MARKERS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            personal_count += len(matches)
-            if matches:
-                personal_matches.extend([m.strip() for m in matches[:3]])
+        for pattern in _PERSONAL_MARKER_PATTERNS:
+            # Count lazily; only the first three hits are kept as examples
+            for i, match in enumerate(pattern.finditer(text)):
+                if i < 3:
+                    personal_matches.append(match.group().strip())
+                personal_count += 1
         marker_counts['personal_voice'] = personal_count
         if personal_matches:
             markers_found['personal_voice'] = personal_matches[:5]
@@ -742,7 +760,7 @@ class DishonestyAnalyzer:
         authenticity_score += min(emotional_count * 0.8, 4.0)
 
         # Check for specific details (proper nouns are GOOD)
-        proper_nouns = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', text)
+        proper_nouns = _PROPER_NOUN.findall(text)
         # Filter out sentence starters
         specific_count = len([n for n in proper_nouns if len(n) > 3])
         marker_counts['specific_details'] = specific_count
@@ -968,17 +986,19 @@ class PeerComparisonAnalyzer:
         
         # Calculate percentile threshold
         sorted_sus = sorted(suspicious_scores)
+        sorted_auth = sorted(authenticity_scores)
         threshold_idx = int(len(sorted_sus) * self.outlier_percentile / 100)
         sus_threshold = sorted_sus[min(threshold_idx, len(sorted_sus) - 1)]
         
         # Update each result with percentile and outlier info
         outliers = []
         for result in results:
-            # Calculate percentile
-            below_count = sum(1 for s in suspicious_scores if s < result.suspicious_score)
+            # Calculate percentile (bisect_left on the sorted column counts
+            # the peers scoring strictly lower)
+            below_count = bisect_left(sorted_sus, result.suspicious_score)
             result.suspicious_percentile = round(100 * below_count / len(suspicious_scores), 1)
             
-            below_count = sum(1 for s in authenticity_scores if s < result.authenticity_score)
+            below_count = bisect_left(sorted_auth, result.authenticity_score)
             result.authenticity_percentile = round(100 * below_count / len(authenticity_scores), 1)
             
             # Check if outlier
@@ -1222,6 +1242,25 @@ RECOMMENDED APPROACH:
 # CANVAS INTEGRATION
 # =============================================================================
 
+def _decode_json(response) -> Any:
+    """Decode a Canvas response body, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _get_paginated(url: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+    """Fetch every page of a Canvas list endpoint by following Link: rel="next"."""
+    items = []
+    while url:
+        response = _SESSION.get(url, headers=HEADERS, params=params)
+        response.raise_for_status()
+        items.extend(_decode_json(response))
+        url = response.links.get("next", {}).get("url")
+        params = None  # next URL already carries the query string
+    return items
+
+
 def get_courses():
     """Fetch list of courses for the current user."""
     if not HAS_REQUESTS or not API_TOKEN:
@@ -1232,9 +1271,7 @@ def get_courses():
     params = {"enrollment_state": "active", "per_page": 100}
     
     try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        return response.json()
+        return _get_paginated(url, params)
     except Exception as e:
         print(f"Error fetching courses: {e}")
         return []
@@ -1249,9 +1286,7 @@ def get_assignments(course_id: int):
     params = {"per_page": 100}
     
     try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        return response.json()
+        return _get_paginated(url, params)
     except Exception as e:
         print(f"Error fetching assignments: {e}")
         return []
@@ -1265,25 +1300,8 @@ def get_submissions(course_id: int, assignment_id: int):
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions"
     params = {"per_page": 100, "include[]": ["user"]}
     
-    all_submissions = []
-    
     try:
-        while url:
-            response = requests.get(url, headers=HEADERS, params=params)
-            response.raise_for_status()
-            submissions = response.json()
-            all_submissions.extend(submissions)
-            
-            # Check for pagination
-            links = response.headers.get("Link", "")
-            url = None
-            for link in links.split(","):
-                if 'rel="next"' in link:
-                    url = link.split(";")[0].strip().strip("<>")
-                    params = {}  # URL already contains params
-                    break
-        
-        return all_submissions
+        return _get_paginated(url, params)
     except Exception as e:
         print(f"Error fetching submissions: {e}")
         return []
@@ -1,14 +1,37 @@
 import os
+import sys
+import logging
 import platform
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
 import re
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
-from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from datetime import datetime, timedelta
 from pathlib import Path
 import csv
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: orjson decodes submission pages (bodies plus attachment metadata
+# for the whole class) straight from bytes, well ahead of response.json()
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional: requests-cache keeps an on-disk copy of Canvas GET responses
+# (see _create_session)
+try:
+    import requests_cache
+    HAS_REQUESTS_CACHE = True
+except ImportError:
+    HAS_REQUESTS_CACHE = False
 
 # ======================
 # CONFIGURATION
@@ -24,12 +47,36 @@ if not API_TOKEN:
 
 HEADERS = {
     "Authorization": f"Bearer {API_TOKEN}",
-    "Content-Type": "application/json"
 }
 
 # Thresholds for grading (not AI detection)
 MIN_FILE_SIZE = 1024  # 1KB
 
+# Concurrent Canvas reads when prefetching assignment data
+FETCH_WORKERS = 8
+
+# Grade-job progress polling: start fast for small jobs, back off to a cap
+POLL_INITIAL_DELAY = 0.25
+POLL_BACKOFF = 1.6
+POLL_MAX_DELAY = 5.0
+
+# Students per update_grades POST, and how many of those POSTs may be in
+# flight at once (POSTs are not retried, so stay well under rate limits)
+GRADE_BATCH_SIZE = 200
+GRADE_POST_WORKERS = 4
+
+# Cached Canvas responses (submission bodies included) older than this are
+# deleted whenever the cached session is opened
+RESPONSE_CACHE_MAX_AGE = timedelta(days=14)
+
+# Anything but letters, digits, space, underscore and hyphen is replaced in
+# rationale file names
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w -]")
+
+# Per-student detail lines go to this logger (shown with --verbose);
+# per-assignment progress and errors stay on print
+log = logging.getLogger(__name__)
+
 def get_config_dir() -> Path:
     """Get the configuration directory for storing settings."""
     system = platform.system()
@@ -45,31 +92,94 @@ def get_config_dir() -> Path:
     return config_dir
 
 
+def _create_session(use_cache: bool = False) -> requests.Session:
+    """
+    One pooled session for every Canvas call, so each assignment's reads,
+    grade POST and progress polls reuse open TLS connections. Throttling
+    (429) and transient 5xx responses are retried with backoff, honoring
+    Retry-After; POST is never retried. JSON bodies get their Content-Type
+    from json=.
+
+    With requests-cache installed, GETs are also stored in an SQLite file
+    in the config folder and revalidated with If-None-Match on every call,
+    so re-runs (e.g. regrades) only download what changed. Progress polls
+    always go to the network. Those entries expire immediately and are
+    never evicted on their own, so anything older than
+    RESPONSE_CACHE_MAX_AGE is removed here.
+    """
+    if use_cache and HAS_REQUESTS_CACHE:
+        try:
+            config_dir = get_config_dir()
+            config_dir.mkdir(parents=True, exist_ok=True)
+            session = requests_cache.CachedSession(
+                str(config_dir / "canvas_cache"),
+                backend="sqlite",
+                expire_after=requests_cache.EXPIRE_IMMEDIATELY,
+                urls_expire_after={"*/api/v1/progress/*": requests_cache.DO_NOT_CACHE},
+                cache_control=True,
+            )
+        except Exception as e:
+            print(f"⚠️ Response cache unavailable ({e}); fetching without it")
+            session = requests.Session()
+        else:
+            try:
+                session.cache.delete(older_than=RESPONSE_CACHE_MAX_AGE)
+            except Exception:
+                pass  # Older requests-cache: keep the cache, skip the cleanup
+    else:
+        session = requests.Session()
+
+    session.headers.update(HEADERS)
+    session.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    ))
+    return session
+
+
+# Importing this file (GUI worker, automation engine) gives a plain session;
+# the on-disk response cache is opt-in through configure_session(), which
+# main() calls for command-line runs started with --cache.
+SESSION = _create_session(use_cache=False)
+
+
+def configure_session(use_cache: bool) -> None:
+    """Replace the shared session, e.g. to turn the response cache on."""
+    global SESSION
+    SESSION = _create_session(use_cache=use_cache)
+
+
+@lru_cache(maxsize=1)
 def get_output_base_dir() -> Path:
-    """Get base output directory in a cross-platform way."""
-    system = platform.system()
-    
+    """Get base output directory in a cross-platform way (resolved once per run)."""
     # Check for /output directory first (container/deployment environment)
     if os.path.isdir("/output"):
         return Path("/output")
     
-    # Check for custom output directory in JSON config (matches autograder_utils.py)
+    # Check for custom output directory in JSON config (matches autograder_utils.py).
+    # Opening directly covers the missing-file case without a separate stat,
+    # and an existing directory always has an existing parent.
     config_file = get_config_dir() / "settings.json"
-    if config_file.exists():
-        try:
-            import json
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                if "output_directory" in config:
-                    custom_dir = Path(config["output_directory"])
-                    if custom_dir.exists() or custom_dir.parent.exists():
-                        custom_dir.mkdir(parents=True, exist_ok=True)
-                        return custom_dir
-        except Exception:
-            pass  # Fall through to default
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if "output_directory" in config:
+            custom_dir = Path(config["output_directory"])
+            if custom_dir.parent.exists():
+                custom_dir.mkdir(parents=True, exist_ok=True)
+                return custom_dir
+    except Exception:
+        pass  # Missing or unreadable config: fall through to default
     
     # Default location
-    if system == "Windows":
+    if platform.system() == "Windows":
         documents = Path(os.environ.get("USERPROFILE", Path.home())) / "Documents"
     else:
         documents = Path.home() / "Documents"
@@ -77,17 +187,36 @@ def get_output_base_dir() -> Path:
     return documents / "Autograder Rationales"
 
 
-def count_words(text: str) -> int:
-    """Count words in text."""
+def count_words(text: str, limit: Optional[int] = None) -> int:
+    """
+    Count words in text.
+
+    With a limit, splitting stops after limit words, so the result is exact
+    below the limit and capped at limit + 1 above it. That is all a
+    minimum-length check needs, without splitting a whole essay.
+    """
     if not text:
         return 0
-    return len(text.split())
+    if limit is None:
+        return len(text.split())
+    return len(text.split(None, limit))
+
+# Attachment fields Canvas sets once it has rendered a PDF in DocViewer
+_ANNOTATION_KEYS = ("canvadoc_document_id", "preview_url")
 
-def has_pdf_annotations(submission: Dict[str, Any]) -> Tuple[bool, str]:
+def _is_pdf(attachment: Dict[str, Any]) -> bool:
+    """True if the attachment is a PDF by MIME type or file extension."""
+    return ((attachment.get("content-type") or "").startswith("application/pdf")
+            or (attachment.get("filename") or "").lower().endswith(".pdf"))
+
+def has_pdf_annotations(submission: Dict[str, Any], *,
+                        pdf_flags: Optional[List[bool]] = None) -> Tuple[bool, str]:
     """
     Check if submission has PDF annotations.
     Canvas uses 'student_annotation' type when students annotate instructor-provided PDFs.
     For student-uploaded PDFs, it uses 'online_upload' with canvadoc_document_id.
+    pdf_flags, if given, holds _is_pdf() for each attachment in order so a
+    caller that already classified them doesn't pay for it twice.
     Returns: (has_annotations, debug_info)
     """
     submission_type = submission.get("submission_type")
@@ -96,7 +225,7 @@ def has_pdf_annotations(submission: Dict[str, Any]) -> Tuple[bool, str]:
     # CRITICAL: Canvas uses "student_annotation" type when students annotate 
     # a PDF that the instructor provided in the assignment
     if submission_type == "student_annotation":
-        print(f"   📝 Found student_annotation submission for user {user_id}")
+        log.debug("   📝 Found student_annotation submission for user %s", user_id)
         return True, "student_annotation type"
     
     # Check if this is an online_upload submission with annotations
@@ -106,21 +235,20 @@ def has_pdf_annotations(submission: Dict[str, Any]) -> Tuple[bool, str]:
         if not attachments:
             return False, "No attachments"
         
-        for attachment in attachments:
-            # Check if it's a PDF
-            content_type = attachment.get("content-type", "")
-            filename = attachment.get("filename", "")
-            is_pdf = content_type.startswith("application/pdf") or filename.lower().endswith(".pdf")
-            
+        if pdf_flags is None:
+            pdf_flags = [_is_pdf(a) for a in attachments]
+        
+        for attachment, is_pdf in zip(attachments, pdf_flags):
             if is_pdf:
                 # Check for canvadoc_document_id - this indicates the PDF was viewed/annotated in Canvas
                 if attachment.get("canvadoc_document_id"):
-                    print(f"   📝 Found annotated PDF for user {user_id} (canvadoc ID: {attachment.get('canvadoc_document_id')})")
+                    log.debug("   📝 Found annotated PDF for user %s (canvadoc ID: %s)",
+                              user_id, attachment.get("canvadoc_document_id"))
                     return True, f"Has canvadoc_document_id"
                 
                 # Also check if there's a preview_url which indicates Canvas processed the document
                 if attachment.get("preview_url"):
-                    print(f"   📝 Found PDF with preview for user {user_id}")
+                    log.debug("   📝 Found PDF with preview for user %s", user_id)
                     return True, f"Has preview_url"
     
     return False, f"Not annotation type (type: {submission_type})"
@@ -138,7 +266,7 @@ def _extract_attachment_text(attachment: Dict[str, Any]) -> str:
     filename = (attachment.get("filename") or "").lower()
     content_type = (attachment.get("content-type") or "").lower()
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=60)
+        resp = SESSION.get(url, timeout=60)
         resp.raise_for_status()
         data = resp.content
 
@@ -178,11 +306,9 @@ def _extract_attachment_text(attachment: Dict[str, Any]) -> str:
             from odf.text import P
             from odf import teletype
             doc = odf_load(io.BytesIO(data))
-            return "\n".join(
-                teletype.extractText(p)
-                for p in doc.getElementsByType(P)
-                if teletype.extractText(p).strip()
-            )
+            # Extract each paragraph once, then drop the blank ones
+            paragraphs = (teletype.extractText(p) for p in doc.getElementsByType(P))
+            return "\n".join(t for t in paragraphs if t.strip())
 
         # PDF — extract raw text
         if filename.endswith(".pdf") or content_type.startswith("application/pdf"):
@@ -202,9 +328,12 @@ def _extract_attachment_text(attachment: Dict[str, Any]) -> str:
     return ""
 
 
-def evaluate_submission(submission: Dict[str, Any], all_submissions: List[Dict[str, Any]], min_word_count: int) -> Tuple[bool, List[str]]:
+def evaluate_submission(submission: Dict[str, Any],
+                        all_submissions: Optional[List[Dict[str, Any]]] = None,
+                        min_word_count: int = 50) -> Tuple[bool, List[str]]:
     """
     Determine if submission shows good faith effort.
+    all_submissions is accepted for older callers and not used.
     Returns: (is_complete, list_of_flags)
     """
     flags = []
@@ -213,41 +342,43 @@ def evaluate_submission(submission: Dict[str, Any], all_submissions: List[Dict[s
     submission_type = submission.get("submission_type")
     user_id = submission.get("user_id")
     
+    # Classify attachments once; the annotation check and the per-file
+    # checks below both use it
+    attachments = submission.get("attachments") or []
+    pdf_flags = [_is_pdf(a) for a in attachments]
+    
     # First, check if this is a PDF submission with annotations
     # If it has annotations, we consider it valid and complete
-    has_annotations, debug_info = has_pdf_annotations(submission)
+    has_annotations, debug_info = has_pdf_annotations(submission, pdf_flags=pdf_flags)
     if has_annotations:
-        print(f"   ✅ User {user_id}: PDF with annotations detected - marking complete")
+        log.debug("   ✅ User %s: PDF with annotations detected - marking complete", user_id)
         return True, flags  # PDF with annotations is automatically valid
     
     # Check text body
     body = submission.get("body", "")
     if body:
         has_content = True
-        word_count = count_words(body)
+        word_count = count_words(body, min_word_count)
         
         # Short text check
         if word_count > 0 and word_count < min_word_count:
             flags.append(f"Very short text ({word_count} words)")
     
     # Check attachments — extract text for word-count checking
-    attachments = submission.get("attachments", [])
     if attachments:
         has_content = True
-        for file in attachments:
+        for file, is_pdf in zip(attachments, pdf_flags):
             file_size = file.get("size", 0)
             file_name = file.get("filename", "unknown")
-            content_type = file.get("content-type", "")
-            is_pdf = content_type.startswith("application/pdf") or file_name.lower().endswith(".pdf")
 
             extracted = _extract_attachment_text(file)
             if extracted.strip():
-                word_count = count_words(extracted)
+                word_count = count_words(extracted, min_word_count)
                 if word_count > 0 and word_count < min_word_count:
                     flags.append(f"Short submission '{file_name}' ({word_count} words, min: {min_word_count})")
             else:
                 # Text extraction unavailable — fall back to heuristic checks
-                if is_pdf and not file.get("canvadoc_document_id") and not file.get("preview_url"):
+                if is_pdf and not any(file.get(k) for k in _ANNOTATION_KEYS):
                     flags.append(f"PDF '{file_name}' uploaded without annotations — may need manual review")
                 elif not is_pdf and file_size > 0 and file_size < MIN_FILE_SIZE:
                     flags.append(f"Small file '{file_name}' ({file_size} bytes)")
@@ -264,41 +395,57 @@ def evaluate_submission(submission: Dict[str, Any], all_submissions: List[Dict[s
     
     is_complete = has_content and is_submitted
     
-    print(f"   🔍 User {user_id}: type={submission_type}, has_content={has_content}, is_submitted={is_submitted}, complete={is_complete}")
+    log.debug("   🔍 User %s: type=%s, has_content=%s, is_submitted=%s, complete=%s",
+              user_id, submission_type, has_content, is_submitted, is_complete)
     
     return is_complete, flags
 
+def _decode_json(response) -> Any:
+    """Decode a Canvas response body, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _paginate(url: str, params: Dict[str, Any], what: str) -> Optional[List[Dict]]:
+    """
+    Fetch every page of a Canvas list endpoint by following Link: rel="next".
+    Returns None (after printing why) if any page fails.
+    """
+    items = []
+    while url:
+        response = SESSION.get(url, params=params, timeout=30)
+
+        if not response.headers.get('Content-Type', '').startswith('application/json'):
+            print("⚠️ Received non-JSON response (likely redirected to login):")
+            print(response.text[:300])
+            return None
+
+        if response.status_code != 200:
+            print(f"❌ Failed to fetch {what}: {response.text}")
+            return None
+
+        data = _decode_json(response)
+        if not isinstance(data, list):
+            print(f"❌ Unexpected {what} format")
+            return None
+
+        items.extend(data)
+        url = response.links.get("next", {}).get("url")
+        params = None  # next URL already carries the query string
+    return items
+
 def get_active_students(course_id: int) -> List[Dict]:
     print("📥 Fetching active student enrollments...")
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/enrollments"
     params = {"type": ["StudentEnrollment"], "state": ["active"], "per_page": 100}
-    response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-
-    if not response.headers.get('Content-Type', '').startswith('application/json'):
-        print("⚠️ Received non-JSON response (likely redirected to login):")
-        print(response.text[:300])
-        return []
-
-    if response.status_code != 200:
-        print(f"❌ Failed to fetch enrollments: {response.text}")
-        return []
-
-    data = response.json()
-    return data if isinstance(data, list) else []
+    return _paginate(url, params, "enrollments") or []
 
 def get_all_assignments(course_id: int) -> List[Dict]:
     """Fetch all assignments in the course."""
     print("📚 Fetching all assignments...")
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments"
     params = {"per_page": 100}
-    response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-
-    if response.status_code != 200:
-        print(f"❌ Failed to fetch assignments: {response.text}")
-        return []
-
-    data = response.json()
-    return data if isinstance(data, list) else []
+    return _paginate(url, params, "assignments") or []
 
 def filter_complete_incomplete_assignments(assignments: List[Dict], include_no_deadline: bool = False, grade_future_submitted: bool = False) -> List[Dict]:
     """
@@ -433,77 +580,46 @@ def get_submissions(course_id: int, assignment_id: int) -> Dict[int, Dict]:
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions"
     params = {"include": ["attachments", "user"], "per_page": 100}
 
-    all_submissions = []
-    page_count = 0
-
-    while url:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        page_count += 1
-
-        if not response.headers.get('Content-Type', '').startswith('application/json'):
-            print("⚠️ Received non-JSON response (likely redirected to login):")
-            print(response.text[:300])
-            return {}
-
-        if response.status_code != 200:
-            print(f"❌ Failed to fetch submissions: {response.text}")
-            return {}
-
-        data = response.json()
-        if not isinstance(data, list):
-            print("❌ Unexpected submission format")
-            return {}
-
-        all_submissions.extend(data)
-
-        # Check for next page in Link header
-        link_header = response.headers.get('Link', '')
-        url = None
-        params = None  # Clear params for subsequent pages (they're in the URL)
+    all_submissions = _paginate(url, params, "submissions")
+    if all_submissions is None:
+        return {}
 
-        if link_header:
-            # Parse Link header for 'next' relation
-            for link in link_header.split(','):
-                if 'rel="next"' in link:
-                    # Extract URL from <URL>
-                    url = link[link.find('<')+1:link.find('>')]
-                    break
-
-    if page_count > 1:
-        print(f"   📄 Fetched {len(all_submissions)} submissions across {page_count} pages")
+    if len(all_submissions) > params["per_page"]:
+        print(f"   📄 Fetched {len(all_submissions)} submissions")
 
     return {sub.get("user_id"): sub for sub in all_submissions if sub.get("user_id")}
 
+@lru_cache(maxsize=None)
 def get_assignment_name(course_id: int, assignment_id: int) -> str:
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}"
-    resp = requests.get(url, headers=HEADERS, timeout=30)
+    resp = SESSION.get(url, timeout=30)
     if resp.status_code == 200:
         try:
-            return resp.json().get("name", f"Assignment {assignment_id}")
+            return _decode_json(resp).get("name", f"Assignment {assignment_id}")
         except:
             pass
     return f"Assignment {assignment_id}"
 
 def grade_assignment(course_id: int, assignment_id: int, students: List[Dict], 
                      submissions: Dict[int, Dict], min_word_count: int, 
-                     regrade_mode: bool = False) -> List[Dict]:
+                     regrade_mode: bool = False) -> Tuple[List[Dict], Dict[int, Tuple[bool, List[str]]]]:
     """
-    Grade assignment and return list of flagged submissions.
+    Grade assignment and return flagged submissions plus every evaluation made.
     
     Args:
         regrade_mode: If True, only grade "incomplete" submissions (don't change "complete" to "incomplete")
     
-    Returns: List of dicts with 'name', 'user_id', 'flags'
+    Returns: (flagged, evaluations) where flagged is a list of dicts with
+        'name', 'user_id', 'flags' and evaluations maps user_id to the
+        (is_complete, flags) result of evaluate_submission
     """
     grade_data = {}
+    evaluations: Dict[int, Tuple[bool, List[str]]] = {}
     marked_complete = 0
     marked_incomplete = 0
     skipped_already_complete = 0
     flagged_submissions = []
     
-    # Convert submissions dict to list for duplicate checking
-    all_submissions_list = list(submissions.values())
-
     for enrollment in students:
         user_id = enrollment.get("user_id")
         if not user_id:
@@ -517,11 +633,12 @@ def grade_assignment(course_id: int, assignment_id: int, students: List[Dict],
             
             # In regrade mode, skip students who already have "complete"
             if regrade_mode and current_grade == "complete":
-                print(f"   ⏭️  User {user_id}: Already complete, skipping")
+                log.debug("   ⏭️  User %s: Already complete, skipping", user_id)
                 skipped_already_complete += 1
                 continue
             
-            is_complete, flags = evaluate_submission(submission, all_submissions_list, min_word_count)
+            is_complete, flags = evaluate_submission(submission, min_word_count=min_word_count)
+            evaluations[user_id] = (is_complete, flags)
             
             if is_complete:
                 grade = "complete"
@@ -544,7 +661,7 @@ def grade_assignment(course_id: int, assignment_id: int, students: List[Dict],
             if regrade_mode and submission:
                 current_grade = submission.get("grade")
                 if current_grade == "complete":
-                    print(f"   ⏭️  User {user_id}: Already complete (no submission), skipping")
+                    log.debug("   ⏭️  User %s: Already complete (no submission), skipping", user_id)
                     skipped_already_complete += 1
                     continue
             
@@ -557,9 +674,8 @@ def grade_assignment(course_id: int, assignment_id: int, students: List[Dict],
         print("⚠️ No students to grade for this assignment.")
         if regrade_mode and skipped_already_complete > 0:
             print(f"   (All {skipped_already_complete} students already marked complete)")
-        return flagged_submissions
+        return flagged_submissions, evaluations
 
-    payload = {"grade_data": grade_data}
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions/update_grades"
 
     print(f"\n✅ Submitting grades for assignment {assignment_id} ({len(grade_data)} students)...")
@@ -569,72 +685,115 @@ def grade_assignment(course_id: int, assignment_id: int, students: List[Dict],
     if flagged_submissions:
         print(f"   ⚠️  Flagged for review: {len(flagged_submissions)}")
 
-    response = requests.post(url, headers=HEADERS, json=payload, timeout=60)
+    # Large classes go up as several smaller update_grades jobs so Canvas
+    # can work on them side by side; small classes stay a single POST.
+    items = iter(grade_data.items())
+    batches = [dict(islice(items, GRADE_BATCH_SIZE))
+               for _ in range(0, len(grade_data), GRADE_BATCH_SIZE)]
+    if len(batches) > 1:
+        print(f"   📦 Posting in {len(batches)} batches of up to {GRADE_BATCH_SIZE} students")
+
+    with ThreadPoolExecutor(max_workers=min(len(batches), GRADE_POST_WORKERS)) as pool:
+        submitted = list(pool.map(
+            lambda batch: _submit_grade_batch(url, batch, assignment_id), batches))
+
+    failed = [batch for batch, (ok, _) in zip(batches, submitted) if not ok]
+    if failed:
+        not_graded = sum(len(batch) for batch in failed)
+        print(f"❌ Assignment {assignment_id}: {len(failed)} of {len(batches)} batches failed "
+              f"({not_graded} students not graded)")
+        if len(failed) == len(batches):
+            return flagged_submissions, evaluations
+
+    job_ids = [job_id for ok, job_id in submitted if ok and job_id]
+    if job_ids:
+        with ThreadPoolExecutor(max_workers=len(job_ids)) as pool:
+            list(pool.map(_wait_for_grade_job, job_ids))
+
+    if not failed:
+        print(f"✅ Assignment {assignment_id}: Grades processed!")
+    return flagged_submissions, evaluations
+
+def _submit_grade_batch(url: str, grade_data: Dict[str, Dict],
+                        assignment_id: int) -> Tuple[bool, Optional[Any]]:
+    """
+    POST one update_grades batch.
+    Returns: (accepted, job_id) — job_id is None when Canvas returned no
+    progress job to wait on.
+    """
+    response = SESSION.post(url, json={"grade_data": grade_data}, timeout=60)
 
     if response.status_code not in (200, 201):
         print(f"❌ Assignment {assignment_id}: Failed to submit grades ({response.status_code})")
         print(response.text[:500])
-        return flagged_submissions
+        return False, None
 
-    # Poll job progress
     try:
-        progress_data = response.json()
-        job_id = progress_data.get("id")
-        if not job_id:
-            print("⚠️ No job ID — assuming immediate success.")
-            return flagged_submissions
+        job_id = _decode_json(response).get("id")
     except Exception:
         print("⚠️ Could not parse job ID.")
-        return flagged_submissions
+        return True, None
+    if not job_id:
+        print("⚠️ No job ID — assuming immediate success.")
+    return True, job_id
 
+def _wait_for_grade_job(job_id: Any) -> None:
+    """Poll a Canvas progress job until it completes, fails or times out."""
     print(f"⏳ Waiting for grade job {job_id} to finish...")
     progress_url = f"{CANVAS_BASE_URL}/api/v1/progress/{job_id}"
     max_wait_seconds = 300  # 5 minutes max
     start_time = time.time()
+    delay = POLL_INITIAL_DELAY
     while True:
         # Check timeout
         if time.time() - start_time > max_wait_seconds:
             print(f"⚠️ Job timeout after {max_wait_seconds}s - assuming success")
             break
 
-        prog_resp = requests.get(progress_url, headers=HEADERS, timeout=30)
+        prog_resp = SESSION.get(progress_url, timeout=30)
         if prog_resp.status_code != 200:
             print(f"⚠️ Could not check job status (HTTP {prog_resp.status_code})")
             break
 
         try:
-            status = prog_resp.json()
+            status = _decode_json(prog_resp)
             state = status.get("workflow_state", "unknown")
             if state == "completed":
-                print("✅ Grade update completed!")
+                print(f"✅ Grade job {job_id} completed!")
                 break
             elif state == "failed":
                 msg = status.get("message", "Unknown error")
-                print(f"❌ Job failed: {msg}")
+                print(f"❌ Job {job_id} failed: {msg}")
                 break
+            elif (status.get("completion") or 0) >= 100:
+                # Work is done, only the state flip is pending; recheck soon
+                time.sleep(POLL_INITIAL_DELAY)
             else:
-                time.sleep(3)
+                time.sleep(delay)
+                delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
         except Exception as e:
             print(f"⚠️ Error reading progress: {e}")
             break
 
-    print(f"✅ Assignment {assignment_id}: Grades processed!")
-    return flagged_submissions
+@lru_cache(maxsize=1)
+def _rationale_output_dir() -> Path:
+    """Create the rationale folder on first use; later exports reuse it."""
+    output_dir = get_output_base_dir() / "Complete-Incomplete Assignments"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
 
-def export_rationale(course_id: int, assignment_id: int, assignment_name: str, rationale_rows: List[Dict], legacy_csv: bool = False):
+def export_rationale(course_id: int, assignment_id: int, assignment_name: str, rationale_rows: List[Dict],
+                     legacy_csv: bool = False, timestamp: Optional[str] = None):
     if not legacy_csv:
         return
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_name = "".join(c if c.isalnum() or c in " _-" else "_" for c in assignment_name)
+    # main() passes one run timestamp so every file from a run matches
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_name = _UNSAFE_FILENAME_CHARS.sub("_", assignment_name)
     filename = f"complete_incomplete_rationale_{course_id}_{safe_name}_{timestamp}.csv"
 
-    # Cross-platform output base
-    BASE_DIR = get_output_base_dir()
-
-    OUTPUT_DIR = BASE_DIR / "Complete-Incomplete Assignments"
-    
     try:
-        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        OUTPUT_DIR = _rationale_output_dir()
     except Exception as e:
         print(f"❌ Failed to create output directory: {e}")
         return
@@ -642,24 +801,24 @@ def export_rationale(course_id: int, assignment_id: int, assignment_name: str, r
     output_path = OUTPUT_DIR / filename
 
     try:
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "Student Name", "User ID", "Grade", "Reason"
-            ])
-            writer.writeheader()
-            for row in rationale_rows:
-                writer.writerow({
-                    "Student Name": row["name"],
-                    "User ID": row["user_id"],
-                    "Grade": row["grade"],
-                    "Reason": row["reason"]
-                })
+        with open(output_path, "w", newline="", encoding="utf-8",
+                  buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(["Student Name", "User ID", "Grade", "Reason"])
+            writer.writerows(
+                (row["name"], row["user_id"], row["grade"], row["reason"])
+                for row in rationale_rows
+            )
         print(f"✅ Rationale exported: {output_path.name}")
             
     except Exception as e:
         print(f"❌ Error creating CSV file: {e}")
 
 def main():
+    # The cache stores submission text, so it is opt-in (--cache), matching
+    # the automation engine's canvas_response_cache default
+    configure_session(use_cache="--cache" in sys.argv[1:])
+    run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     print("🎓 Canvas Auto-Grader: Complete/Incomplete with PDF Annotation Support")
     print("Make sure CANVAS_API_TOKEN is set in your environment.\n")
 
@@ -684,7 +843,7 @@ def main():
     # Verify API access
     print("🔍 Verifying Canvas API access...")
     test_url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}"
-    test_resp = requests.get(test_url, headers=HEADERS, timeout=30)
+    test_resp = SESSION.get(test_url, timeout=30)
     if not test_resp.headers.get('Content-Type', '').startswith('application/json'):
         print("❌ CRITICAL: Received HTML (e.g., OpenCCC login page).")
         print("   Check your token, URL, and internet connection.")
@@ -734,6 +893,7 @@ def main():
             print("❌ Invalid choice. Please enter 1, 2, 3, N, or F")
             continue
 
+    all_assignments: List[Dict] = []
     if selection_mode == "2":
         # Auto-detect complete/incomplete assignments
         print("\n🔍 Scanning for complete/incomplete assignments...")
@@ -848,6 +1008,11 @@ def main():
             print("❌ Invalid assignment ID(s).")
             return
         
+        # One listing request names several IDs at once; a single ID is
+        # cheaper to look up directly below
+        if len(set(assignment_ids)) > 1:
+            all_assignments = get_all_assignments(course_id)
+        
         # Default to regrade mode for manual entry
         regrade_mode = True
         print("✅ Using regrade mode: Will only update 'incomplete' submissions")
@@ -864,38 +1029,61 @@ def main():
         print("⚠️ Invalid input. Using default minimum word count of 50.")
         MIN_WORD_COUNT = 50
 
-    students = get_active_students(course_id)
+    # Names come from the assignment listing when we have it; only manually
+    # entered IDs need a lookup. All reads run concurrently up front, then
+    # each assignment is graded and posted in turn.
+    assignment_names = {a.get("id"): a.get("name", f"Assignment {a.get('id')}")
+                        for a in all_assignments}
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        students_future = pool.submit(get_active_students, course_id)
+        name_futures = {aid: pool.submit(get_assignment_name, course_id, aid)
+                        for aid in set(assignment_ids) - assignment_names.keys()}
+        submission_futures = {aid: pool.submit(get_submissions, course_id, aid)
+                              for aid in dict.fromkeys(assignment_ids)}
+        students = students_future.result()
+        for aid, future in name_futures.items():
+            assignment_names[aid] = future.result()
+        submissions_by_assignment = {aid: future.result()
+                                     for aid, future in submission_futures.items()}
+
     if not students:
         print("🛑 No active students found. Exiting.")
         return
     
     print(f"✅ Found {len(students)} active students\n")
+
+    # Roster names don't change between assignments; resolve them once
+    student_names = {e["user_id"]: e.get("user", {}).get("name", f"User {e['user_id']}")
+                     for e in students if e.get("user_id")}
     
     all_flagged = {}
-    for idx, aid in enumerate(assignment_ids, 1):
-        print(f"\n{'='*70}")
-        print(f"Processing assignment {idx}/{len(assignment_ids)}")
-        print(f"{'='*70}")
-        
-        assignment_name = get_assignment_name(course_id, aid)
-        submissions = get_submissions(course_id, aid)
-        flagged = grade_assignment(course_id, aid, students, submissions, MIN_WORD_COUNT, regrade_mode)
-        if flagged:
-            all_flagged[aid] = flagged
-
-        # Build rationale rows for THIS assignment
-        rationale_rows = []
-        for enrollment in students:
-            user_id = enrollment.get("user_id")
-            if not user_id:
-                continue
-            submission = submissions.get(user_id)
-            student_name = enrollment.get("user", {}).get("name", f"User {user_id}")
-
-            # Check if skipped due to regrade mode
-            if regrade_mode and submission:
-                current_grade = submission.get("grade")
-                if current_grade == "complete":
+    # Rationale files are written in the background so local disk I/O
+    # overlaps grading and posting the next assignment; leaving the block
+    # waits for every write
+    with ThreadPoolExecutor(max_workers=2) as csv_pool:
+        for idx, aid in enumerate(assignment_ids, 1):
+            print(f"\n{'='*70}")
+            print(f"Processing assignment {idx}/{len(assignment_ids)}")
+            print(f"{'='*70}")
+            
+            assignment_name = assignment_names[aid]
+            submissions = submissions_by_assignment[aid]
+            flagged, evaluations = grade_assignment(course_id, aid, students, submissions, MIN_WORD_COUNT, regrade_mode)
+            if flagged:
+                all_flagged[aid] = flagged
+
+            # Build rationale rows for THIS assignment
+            rationale_rows = []
+            for user_id, student_name in student_names.items():
+                submission = submissions.get(user_id)
+                if submission:
+                    workflow_state = submission.get("workflow_state")
+                    current_grade = submission.get("grade")
+                else:
+                    workflow_state = current_grade = None
+
+                # Check if skipped due to regrade mode
+                if regrade_mode and current_grade == "complete":
                     rationale_rows.append({
                         "name": student_name,
                         "user_id": user_id,
@@ -904,23 +1092,26 @@ def main():
                     })
                     continue
 
-            if submission and submission.get("workflow_state") != "unsubmitted":
-                is_complete, flags = evaluate_submission(submission, list(submissions.values()), MIN_WORD_COUNT)
-                grade = "complete" if is_complete else "incomplete"
-                reason = "; ".join(flags) if flags else "Meets requirements" if is_complete else "Incomplete submission"
-            else:
-                grade = "incomplete"
-                reason = "No submission"
-
-            rationale_rows.append({
-                "name": student_name,
-                "user_id": user_id,
-                "grade": grade,
-                "reason": reason
-            })
+                if submission and workflow_state != "unsubmitted":
+                    # Reuse grade_assignment's verdict; re-evaluating would
+                    # re-download every attachment
+                    is_complete, flags = evaluations[user_id]
+                    grade = "complete" if is_complete else "incomplete"
+                    reason = "; ".join(flags) if flags else "Meets requirements" if is_complete else "Incomplete submission"
+                else:
+                    grade = "incomplete"
+                    reason = "No submission"
+
+                rationale_rows.append({
+                    "name": student_name,
+                    "user_id": user_id,
+                    "grade": grade,
+                    "reason": reason
+                })
 
-        export_rationale(course_id, aid, assignment_name, rationale_rows)
-        print()
+            csv_pool.submit(export_rationale, course_id, aid, assignment_name,
+                            rationale_rows, timestamp=run_timestamp)
+            print()
 
     print("\n" + "="*70)
     print("🏁 All assignments processed.")
@@ -932,7 +1123,7 @@ def main():
         print("⚠️  FLAGGED SUBMISSIONS FOR REVIEW")
         print("="*70)
         for assignment_id, flagged_list in all_flagged.items():
-            assignment_name = get_assignment_name(course_id, assignment_id)
+            assignment_name = assignment_names[assignment_id]
             print(f"\n📋 {assignment_name} (ID: {assignment_id}): {len(flagged_list)} flagged")
             print("-" * 70)
             for item in flagged_list:
@@ -945,4 +1136,8 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG if "--verbose" in sys.argv[1:] else logging.WARNING,
+        format="%(message)s",
+    )
     main()
\ No newline at end of file
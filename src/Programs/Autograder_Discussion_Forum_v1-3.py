@@ -2,13 +2,22 @@ import os
 import platform
 import requests
 import time
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime
 from pathlib import Path
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from dateutil import parser
 import pytz
 
+# orjson is optional; when present it decodes the topic, enrollment and
+# entry pages straight from bytes
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # ======================
 # CONFIGURATION
 # ======================
@@ -23,9 +32,17 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+# One pooled session for all Canvas calls so pages, topic views, and progress
+# polls reuse the same keep-alive connection instead of a new TLS handshake each
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+
 # Grading thresholds
 MIN_WORD_COUNT = 50
 
+# Concurrent Canvas requests when prefetching discussion entries
+FETCH_WORKERS = 8
+
 def get_config_dir() -> Path:
     """Get the configuration directory for storing settings."""
     system = platform.system()
@@ -83,20 +100,41 @@ def count_words(text: str) -> int:
     return len(text.split())
 
 
+def decode_json(response) -> Any:
+    """Decode a Canvas response body, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def get_paginated(url: str, params: Dict[str, Any] = None) -> List[Dict]:
+    """Fetch every page of a Canvas list endpoint by following Link: rel="next".
+
+    Raises requests.HTTPError if any page fails.
+    """
+    items = []
+    while url:
+        response = SESSION.get(url, params=params)
+        response.raise_for_status()
+        data = decode_json(response)
+        if isinstance(data, list):
+            items.extend(data)
+        url = response.links.get("next", {}).get("url")
+        params = None  # next URL already carries the query string
+    return items
+
+
 def get_active_students(course_id: int) -> List[Dict]:
     """Fetch active student enrollments."""
     print("📥 Fetching active student enrollments...")
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/enrollments"
     params = {"type": ["StudentEnrollment"], "state": ["active"], "per_page": 100}
-    response = requests.get(url, headers=HEADERS, params=params)
-
-    if response.status_code != 200:
-        print(f"❌ Failed to fetch enrollments: {response.text}")
+    try:
+        return get_paginated(url, params)
+    except requests.HTTPError as e:
+        print(f"❌ Failed to fetch enrollments: {e.response.text}")
         return []
 
-    data = response.json()
-    return data if isinstance(data, list) else []
-
 
 def enable_grading_on_discussion(course_id: int, topic_id: int, points_possible: int = 10, 
                                   grading_type: str = "pass_fail") -> Dict:
@@ -130,7 +168,7 @@ def enable_grading_on_discussion(course_id: int, topic_id: int, points_possible:
     
     print(f"   🔧 Enabling grading on discussion (creating assignment)...")
     
-    response = requests.put(url, headers=HEADERS, json=payload)
+    response = SESSION.put(url, json=payload)
     
     if response.status_code == 200:
         data = response.json()
@@ -152,15 +190,12 @@ def get_all_discussion_topics(course_id: int) -> List[Dict]:
     print("📚 Fetching all discussion topics...")
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/discussion_topics"
     params = {"per_page": 100}
-    response = requests.get(url, headers=HEADERS, params=params)
-
-    if response.status_code != 200:
-        print(f"❌ Failed to fetch discussion topics: {response.text}")
+    try:
+        return get_paginated(url, params)
+    except requests.HTTPError as e:
+        print(f"❌ Failed to fetch discussion topics: {e.response.text}")
         return []
 
-    data = response.json()
-    return data if isinstance(data, list) else []
-
 
 def filter_graded_discussions(discussions: List[Dict], grading_filter: str = "all", include_no_deadline: bool = False, grade_future_submitted: bool = False) -> List[Dict]:
     """
@@ -234,14 +269,14 @@ def filter_graded_discussions(discussions: List[Dict], grading_filter: str = "al
 def fetch_discussion_entries(course_id: int, topic_id: int) -> List[Dict]:
     """Fetch all entries (including replies) for a discussion topic."""
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/discussion_topics/{topic_id}/view"
-    resp = requests.get(url, headers=HEADERS)
+    resp = SESSION.get(url)
     
     if resp.status_code != 200:
         print(f"⚠️  Failed to fetch discussion {topic_id} (HTTP {resp.status_code})")
         return []
     
     try:
-        data = resp.json()
+        data = decode_json(resp)
         entries = data.get("view", [])
     except Exception as e:
         print(f"   ❌ JSON decode error: {e}")
@@ -341,20 +376,25 @@ def evaluate_discussion_post(posts: List[str], grading_criteria: Dict[str, Any],
 
 def grade_discussion_topic(course_id: int, topic_id: int, topic_name: str, 
                           students: List[Dict], min_word_count: int,
-                          grading_type: str, regrade_mode: bool = False) -> Tuple[List[Dict], Dict]:
+                          grading_type: str, regrade_mode: bool = False, *,
+                          entries: Optional[List[Dict]] = None,
+                          topic: Optional[Dict] = None) -> Tuple[List[Dict], Dict]:
     """
     Grade a discussion topic.
     
     Args:
         grading_type: "pass_fail" or "points"/"letter_grade" etc.
         regrade_mode: If True, don't lower existing grades
+        entries: Prefetched discussion entries; fetched here when None
+        topic: This topic's record from the course topic list; fetched here when None
     
     Returns: (flagged_submissions, student_grades_dict)
     """
     print(f"\n📝 Grading: {topic_name}")
     
     # Fetch all discussion entries
-    entries = fetch_discussion_entries(course_id, topic_id)
+    if entries is None:
+        entries = fetch_discussion_entries(course_id, topic_id)
     if not entries:
         print(f"   ⚠️  No entries found for this discussion")
         return [], {}
@@ -373,7 +413,6 @@ def grade_discussion_topic(course_id: int, topic_id: int, topic_name: str,
             student_posts[user_id].append(message)
     
     # Prepare to grade
-    student_ids = {s.get("user_id") for s in students}
     grade_data = {}
     flagged_submissions = []
     student_grades = {}
@@ -383,12 +422,10 @@ def grade_discussion_topic(course_id: int, topic_id: int, topic_name: str,
     skipped_no_downgrade = 0
     
     # Get assignment ID for fetching current grades
-    assignment = None
-    topics_data = get_all_discussion_topics(course_id)
-    for t in topics_data:
-        if t.get("id") == topic_id:
-            assignment = t.get("assignment")
-            break
+    if topic is None:
+        topic = next((t for t in get_all_discussion_topics(course_id)
+                      if t.get("id") == topic_id), {})
+    assignment = topic.get("assignment")
     
     assignment_id = assignment.get("id") if assignment else None
     
@@ -420,14 +457,15 @@ def grade_discussion_topic(course_id: int, topic_id: int, topic_name: str,
     if regrade_mode and assignment_id:
         submissions_url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions"
         params = {"per_page": 100}
-        resp = requests.get(submissions_url, headers=HEADERS, params=params)
-        if resp.status_code == 200:
-            subs = resp.json()
-            current_submissions = {s.get("user_id"): s for s in subs if isinstance(subs, list)}
+        try:
+            subs = get_paginated(submissions_url, params)
+            current_submissions = {s.get("user_id"): s for s in subs}
+        except requests.HTTPError:
+            pass
     
     for student in students:
         user_id = student.get("user_id")
-        if not user_id or user_id not in student_ids:
+        if not user_id:
             continue
         
         student_name = student.get("user", {}).get("name", f"User {user_id}")
@@ -518,7 +556,7 @@ def grade_discussion_topic(course_id: int, topic_id: int, topic_name: str,
     payload = {"grade_data": grade_data}
     url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}/assignments/{assignment_id}/submissions/update_grades"
     
-    response = requests.post(url, headers=HEADERS, json=payload)
+    response = SESSION.post(url, json=payload)
     
     if response.status_code not in (200, 201):
         print(f"   ❌ Failed to submit grades ({response.status_code})")
@@ -533,7 +571,7 @@ def grade_discussion_topic(course_id: int, topic_id: int, topic_name: str,
             print(f"   ⏳ Waiting for grade job to complete...")
             progress_url = f"{CANVAS_BASE_URL}/api/v1/progress/{job_id}"
             while True:
-                prog_resp = requests.get(progress_url, headers=HEADERS)
+                prog_resp = SESSION.get(progress_url)
                 if prog_resp.status_code == 200:
                     status = prog_resp.json()
                     state = status.get("workflow_state", "unknown")
@@ -552,10 +590,21 @@ def grade_discussion_topic(course_id: int, topic_id: int, topic_name: str,
     return flagged_submissions, student_grades
 
 
+def build_student_names(students: List[Dict]) -> Dict:
+    """Map each enrolled student's user_id to their display name."""
+    return {s.get("user_id"): s.get("user", {}).get("name", f"User {s.get('user_id')}")
+            for s in students}
+
+
 def export_rationale(course_id: int, topic_id: int, topic_name: str,
                     student_grades: Dict, students: List[Dict],
-                    legacy_csv: bool = False):
-    """Export grading rationale to CSV."""
+                    legacy_csv: bool = False,
+                    student_names: Optional[Dict] = None):
+    """Export grading rationale to CSV.
+
+    student_names maps user_id to display name; built from students when
+    not supplied.
+    """
     if not legacy_csv:
         return
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -576,23 +625,19 @@ def export_rationale(course_id: int, topic_id: int, topic_name: str,
     output_path = OUTPUT_DIR / filename
     
     # Create student name mapping
-    student_names = {s.get("user_id"): s.get("user", {}).get("name", f"User {s.get('user_id')}") 
-                     for s in students}
+    if student_names is None:
+        student_names = build_student_names(students)
     
     try:
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "Student Name", "User ID", "Grade", "Reason"
-            ])
-            writer.writeheader()
-            
-            for user_id, grade_info in student_grades.items():
-                writer.writerow({
-                    "Student Name": student_names.get(user_id, f"User {user_id}"),
-                    "User ID": user_id,
-                    "Grade": grade_info["grade"],
-                    "Reason": grade_info["reason"]
-                })
+        with open(output_path, "w", newline="", encoding="utf-8",
+                  buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(["Student Name", "User ID", "Grade", "Reason"])
+            writer.writerows(
+                (student_names.get(user_id, f"User {user_id}"), user_id,
+                 grade_info["grade"], grade_info["reason"])
+                for user_id, grade_info in student_grades.items()
+            )
         
         print(f"   ✅ Rationale exported: {output_path.name}")
             
@@ -625,7 +670,7 @@ def main():
     # Verify API access
     print("🔍 Verifying Canvas API access...")
     test_url = f"{CANVAS_BASE_URL}/api/v1/courses/{course_id}"
-    test_resp = requests.get(test_url, headers=HEADERS)
+    test_resp = SESSION.get(test_url)
     if not test_resp.headers.get('Content-Type', '').startswith('application/json'):
         print("❌ CRITICAL: Received HTML response.")
         print("   Check your token, URL, and internet connection.")
@@ -938,27 +983,25 @@ def main():
         
         # Fetch names and grading types
         all_discussions = get_all_discussion_topics(course_id)
+        discussions_by_id = {d.get("id"): d for d in all_discussions}
         topic_ids = []
         ungraded_count = 0
         
         for tid in raw_ids:
-            found = False
-            for d in all_discussions:
-                if d.get("id") == tid:
-                    found = True
-                    assignment = d.get("assignment")
-                    if assignment:
-                        topic_ids.append((tid, d.get("title", f"Discussion {tid}"), 
-                                        assignment.get("grading_type", "")))
-                    else:
-                        # Discussion exists but is not graded - include it anyway
-                        # The grading function will enable grading automatically
-                        topic_ids.append((tid, d.get("title", f"Discussion {tid}"), "pass_fail"))
-                        ungraded_count += 1
-                    break
-            
-            if not found:
+            d = discussions_by_id.get(tid)
+            if d is None:
                 print(f"   ⚠️  Discussion ID {tid} not found in course")
+                continue
+            
+            assignment = d.get("assignment")
+            if assignment:
+                topic_ids.append((tid, d.get("title", f"Discussion {tid}"), 
+                                assignment.get("grading_type", "")))
+            else:
+                # Discussion exists but is not graded - include it anyway
+                # The grading function will enable grading automatically
+                topic_ids.append((tid, d.get("title", f"Discussion {tid}"), "pass_fail"))
+                ungraded_count += 1
         
         # Inform about ungraded discussions
         if ungraded_count > 0:
@@ -975,13 +1018,24 @@ def main():
         regrade_mode = True
         print("✅ Grade protection ON: Will not lower existing grades")
     
+    # Start pulling every topic's entries now so those requests overlap the
+    # enrollment fetch and the grading-scale prompts below
+    print(f"\n📥 Fetching entries for {len(topic_ids)} discussion(s) in the background...")
+    fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+    entry_futures = {tid: fetch_pool.submit(fetch_discussion_entries, course_id, tid)
+                     for tid, _, _ in topic_ids}
+    fetch_pool.shutdown(wait=False)
+    
     # Get students
     students = get_active_students(course_id)
     if not students:
         print("🛑 No active students found. Exiting.")
+        # Nobody to grade: drop the topic fetches that haven't started yet
+        fetch_pool.shutdown(cancel_futures=True)
         return
     
     print(f"✅ Found {len(students)} active students\n")
+    student_names = build_student_names(students)
     
     # Determine grading criteria based on first discussion's type
     # (assuming all selected discussions use same grading type)
@@ -1071,6 +1125,17 @@ def main():
                     print()
         print(f"      F: Below minimum")
     
+    # Index topics by ID once for the per-topic max_points lookup below
+    discussions_by_id = {d.get("id"): d for d in
+                         (all_discussions if 'all_discussions' in locals() else [])}
+    # Each topic's assignment record comes from this one listing rather than
+    # a fresh topic-list fetch per graded discussion
+    topics_by_id = discussions_by_id or {
+        d.get("id"): d for d in get_all_discussion_topics(course_id)}
+    
+    # Collect the prefetched entries; grading and posting stay sequential
+    entries_by_topic = {tid: f.result() for tid, f in entry_futures.items()}
+    
     # Grade each discussion
     all_flagged = {}
     for idx, (topic_id, topic_name, grading_type) in enumerate(topic_ids, 1):
@@ -1080,22 +1145,24 @@ def main():
         
         # Get max points for this discussion
         max_points = 10  # default
-        for d in all_discussions if 'all_discussions' in locals() else []:
-            if d.get("id") == topic_id:
-                assignment = d.get("assignment", {})
-                max_points = assignment.get("points_possible", 10)
-                break
+        d = discussions_by_id.get(topic_id)
+        if d is not None:
+            assignment = d.get("assignment", {})
+            max_points = assignment.get("points_possible", 10)
         
         flagged, student_grades = grade_discussion_topic(
             course_id, topic_id, topic_name, students, 
-            grading_criteria, grading_type, max_points, regrade_mode
+            grading_criteria, grading_type, max_points, regrade_mode,
+            entries=entries_by_topic.get(topic_id),
+            topic=topics_by_id.get(topic_id, {})
         )
         
         if flagged:
             all_flagged[topic_id] = {"name": topic_name, "flagged": flagged}
         
         # Export rationale
-        export_rationale(course_id, topic_id, topic_name, student_grades, students)
+        export_rationale(course_id, topic_id, topic_name, student_grades, students,
+                         student_names=student_names)
     
     print("\n" + "="*70)
     print("🏁 All discussions processed.")
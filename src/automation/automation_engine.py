@@ -66,6 +66,9 @@ class AutomationEngine:
         # LLM reply quality checker (lazy — only used when rule enables it)
         self._reply_checker = None
 
+        # Complete/Incomplete script module (lazy — loaded on first CI rule)
+        self._autograder_ci = None
+
         # Canvas API details
         self.base_url = os.getenv("CANVAS_BASE_URL", "https://cabrillo.instructure.com")
         self.api_token = os.getenv("CANVAS_API_TOKEN")
@@ -290,6 +293,20 @@ class AutomationEngine:
             self.logger.warning(f"    ⚠️  Unknown assignment type: {assignment_type}")
             return 0, 0
 
+    def _load_autograder_ci(self):
+        """Load the Complete/Incomplete script once per engine run."""
+        if self._autograder_ci is None:
+            # Dynamic import for hyphenated filename
+            module_path = Path(__file__).parent.parent / "Programs" / "Autograder_Complete-Incomplete_v1-3.py"
+            spec = importlib.util.spec_from_file_location("autograder_ci", module_path)
+            autograder_ci = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(autograder_ci)
+            autograder_ci.configure_session(
+                use_cache=self.config.global_settings.canvas_response_cache
+            )
+            self._autograder_ci = autograder_ci
+        return self._autograder_ci
+
     def _run_complete_incomplete(self, course_id: int, assignment: Dict[str, Any],
                                  rule: AssignmentRule, course_name: str = "") -> tuple:
         """
@@ -304,11 +321,7 @@ class AutomationEngine:
         Returns:
             Tuple of (graded_count, skipped_count)
         """
-        # Dynamic import for hyphenated filename
-        module_path = Path(__file__).parent.parent / "Programs" / "Autograder_Complete-Incomplete_v1-3.py"
-        spec = importlib.util.spec_from_file_location("autograder_ci", module_path)
-        autograder_ci = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(autograder_ci)
+        autograder_ci = self._load_autograder_ci()
 
         assignment_id = assignment['id']
         assignment_name = assignment['name']
@@ -354,11 +367,10 @@ class AutomationEngine:
 
         # Evaluate submissions
         grade_data = {}
-        all_submissions_list = list(submissions.values())
 
         for user_id, submission in submissions.items():
             is_complete, flags = autograder_ci.evaluate_submission(
-                submission, all_submissions_list, rule.min_word_count
+                submission, min_word_count=rule.min_word_count
             )
 
             if is_complete:
@@ -152,6 +152,10 @@ class GlobalSettings:
     auto_update_enabled: bool = True
     notify_email: str = ""
     n8n_webhook_url: str = ""
+    # Keep an on-disk copy of Canvas responses (requires requests-cache) so
+    # repeat runs only download what changed; off by default because the
+    # cache holds submission text
+    canvas_response_cache: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
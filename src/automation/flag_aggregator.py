@@ -3,10 +3,62 @@ Canvas Autograder - Flag Aggregation System
 Maintains persistent Excel file with student-level summaries and detailed flag logs.
 """
 
-import pandas as pd
+import csv
+import os
+import sys
 from pathlib import Path
 from typing import List, Dict, Any
 from datetime import datetime
+from operator import itemgetter
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Font, PatternFill, Border, Side
+
+# Optional: XlsxWriter's constant_memory mode writes faster than openpyxl
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
+
+
+SUMMARY_COLUMNS = [
+    'Student Name', 'Student ID', 'Total Flags',
+    'Last Flag Date', 'Courses', 'High-Risk Assignments'
+]
+
+DETAIL_COLUMNS = [
+    'Student Name', 'Student ID', 'Course', 'Assignment',
+    'Flag Date', 'Concern Level', 'Suspicious Score',
+    'Authenticity Score', 'Markers Found', 'Context'
+]
+
+# Detail columns drawn from a small set of values (courses, assignments,
+# dates, concern levels); interned on load so repeated cells share one string
+INTERNED_DETAIL_COLUMNS = ('Course', 'Assignment', 'Flag Date', 'Concern Level')
+
+# Header style parts, built once at import and shared by every save
+HEADER_FONT = Font(bold=True)
+HEADER_FILL = PatternFill(fill_type='solid', start_color='FFD9E1F2', end_color='FFD9E1F2')
+HEADER_BORDER = Border(bottom=Side(style='thin'))
+
+# Column widths per sheet, applied before the first row is written
+# (write-only sheets reject dimension changes once rows are streamed)
+SUMMARY_WIDTHS = [
+    ('A', 25), ('B', 12), ('C', 12), ('D', 14), ('E', 40), ('F', 40)
+]
+
+DETAIL_WIDTHS = [
+    ('A', 25), ('B', 12), ('C', 30), ('D', 35), ('E', 12),
+    ('F', 14), ('G', 16), ('H', 18), ('I', 50), ('J', 50)
+]
+
+# Details logs longer than this are kept in a CSV beside the workbook instead
+# of the Details sheet (Excel caps a sheet at 1,048,576 rows, and openpyxl
+# memory grows with row count). Override with AUTOGRADER_MAX_EXCEL_ROWS.
+MAX_EXCEL_ROWS = int(os.environ.get('AUTOGRADER_MAX_EXCEL_ROWS', '200000'))
 
 
 class FlagAggregator:
@@ -20,6 +72,9 @@ class FlagAggregator:
             excel_path: Path to Excel file for flag storage
         """
         self.excel_path = Path(excel_path)
+        self.details_csv_path = self.excel_path.with_name(
+            f"{self.excel_path.stem}_details.csv"
+        )
         self.summary: Dict[int, Dict[str, Any]] = {}  # {student_id: summary_data}
         self.details: List[Dict[str, Any]] = []  # List of detail records
         self.load_existing()
@@ -33,12 +88,28 @@ class FlagAggregator:
             # Load summary sheet
             summary_df = pd.read_excel(self.excel_path, sheet_name='Summary')
             if not summary_df.empty:
-                self.summary = summary_df.set_index('Student ID').to_dict('index')
-
-            # Load details sheet
-            details_df = pd.read_excel(self.excel_path, sheet_name='Details')
+                # Counts are sorted and incremented; a blank or hand-edited
+                # cell counts as 0 rather than surfacing as None
+                summary_df['Total Flags'] = pd.to_numeric(
+                    summary_df['Total Flags'], errors='coerce'
+                ).fillna(0).astype(int)
+                # Blank cells come back as NaN; keep them as None for re-saving
+                summary_df = summary_df.astype(object).where(summary_df.notna(), None)
+                self.summary = summary_df.set_index('Student ID', drop=False).to_dict('index')
+
+            # Load details (from the overflow CSV when the log outgrew Excel)
+            if self.details_csv_path.exists():
+                details_df = pd.read_csv(self.details_csv_path)
+            else:
+                details_df = pd.read_excel(self.excel_path, sheet_name='Details')
             if not details_df.empty:
+                details_df = details_df.astype(object).where(details_df.notna(), None)
                 self.details = details_df.to_dict('records')
+                for record in self.details:
+                    for col in INTERNED_DETAIL_COLUMNS:
+                        value = record.get(col)
+                        if isinstance(value, str):
+                            record[col] = sys.intern(value)
 
         except Exception as e:
             # If file corrupt or missing sheets, start fresh
@@ -53,6 +124,12 @@ class FlagAggregator:
         Args:
             adc_results: List of ADC analysis results with student info
         """
+        # Parsed 'Courses' cells for students touched in this batch; each cell
+        # is split once here and joined once after the loop, not per flag.
+        course_sets: Dict[Any, set] = {}
+        # One timestamp for the whole batch
+        today = datetime.now().strftime('%Y-%m-%d')
+
         for result in adc_results:
             # Only process if concern level warrants flagging
             concern_level = result.get('concern_level', 'None')
@@ -73,7 +150,7 @@ class FlagAggregator:
                 'Student ID': student_id,
                 'Course': course_name,
                 'Assignment': assignment_name,
-                'Flag Date': datetime.now().strftime('%Y-%m-%d'),
+                'Flag Date': today,
                 'Concern Level': concern_level,
                 'Suspicious Score': result.get('suspicious_score', 0),
                 'Authenticity Score': result.get('authenticity_score', 0),
@@ -82,36 +159,42 @@ class FlagAggregator:
             })
 
             # Update summary
-            if student_id in self.summary:
-                self.summary[student_id]['Total Flags'] += 1
-                self.summary[student_id]['Last Flag Date'] = datetime.now().strftime('%Y-%m-%d')
+            entry = self.summary.get(student_id)
+            if entry is not None:
+                entry['Total Flags'] += 1
+                entry['Last Flag Date'] = today
 
                 # Add course if new
-                courses_str = str(self.summary[student_id].get('Courses', ''))
-                courses = set(c.strip() for c in courses_str.split(',') if c.strip())
+                courses = course_sets.get(student_id)
+                if courses is None:
+                    courses_str = str(entry.get('Courses') or '')
+                    courses = set(c.strip() for c in courses_str.split(',') if c.strip())
+                    course_sets[student_id] = courses
                 courses.add(course_name)
-                self.summary[student_id]['Courses'] = ', '.join(sorted(courses))
 
                 # Add high-risk assignment if High/Very High concern
                 if concern_level in ['High', 'Very High']:
-                    high_risk = str(self.summary[student_id].get('High-Risk Assignments', ''))
+                    high_risk = str(entry.get('High-Risk Assignments') or '')
                     if high_risk:
                         high_risk += f", {assignment_name}"
                     else:
                         high_risk = assignment_name
-                    self.summary[student_id]['High-Risk Assignments'] = high_risk
+                    entry['High-Risk Assignments'] = high_risk
             else:
                 # Create new student summary
                 self.summary[student_id] = {
                     'Student Name': student_name,
                     'Student ID': student_id,
                     'Total Flags': 1,
-                    'Last Flag Date': datetime.now().strftime('%Y-%m-%d'),
+                    'Last Flag Date': today,
                     'Courses': course_name,
                     'High-Risk Assignments': assignment_name
                         if concern_level in ['High', 'Very High'] else ''
                 }
 
+        for student_id, courses in course_sets.items():
+            self.summary[student_id]['Courses'] = ', '.join(sorted(courses))
+
     def _format_markers(self, result: Dict[str, Any]) -> str:
         """
         Format detected markers into a readable string.
@@ -155,43 +238,151 @@ class FlagAggregator:
         # Ensure parent directory exists
         self.excel_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create summary DataFrame (sorted by total flags)
-        summary_df = pd.DataFrame(self.summary.values())
-        if not summary_df.empty:
-            summary_df = summary_df.sort_values('Total Flags', ascending=False)
+        # Summary sorted by total flags, details by date (newest first)
+        summary_rows = sorted(self.summary.values(),
+                              key=itemgetter('Total Flags'), reverse=True)
+        detail_rows = sorted(self.details,
+                             key=lambda x: str(x.get('Flag Date', '')), reverse=True)
 
-        # Create details DataFrame (sorted by date, newest first)
-        details_df = pd.DataFrame(self.details)
-        if not details_df.empty:
-            details_df = details_df.sort_values('Flag Date', ascending=False)
+        # Oversized details logs go to CSV; the workbook keeps the summary
+        overflow = len(detail_rows) > MAX_EXCEL_ROWS
+        excel_details = [] if overflow else detail_rows
 
-        # Write to Excel
         try:
-            with pd.ExcelWriter(self.excel_path, engine='openpyxl') as writer:
-                if not summary_df.empty:
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                else:
-                    # Create empty summary sheet
-                    pd.DataFrame(columns=[
-                        'Student Name', 'Student ID', 'Total Flags',
-                        'Last Flag Date', 'Courses', 'High-Risk Assignments'
-                    ]).to_excel(writer, sheet_name='Summary', index=False)
-
-                if not details_df.empty:
-                    details_df.to_excel(writer, sheet_name='Details', index=False)
-                else:
-                    # Create empty details sheet
-                    pd.DataFrame(columns=[
-                        'Student Name', 'Student ID', 'Course', 'Assignment',
-                        'Flag Date', 'Concern Level', 'Suspicious Score',
-                        'Authenticity Score', 'Markers Found', 'Context'
-                    ]).to_excel(writer, sheet_name='Details', index=False)
+            # The CSV goes first: once the workbook's Details sheet is empty,
+            # the CSV is the only copy of the log, so it must already exist
+            if overflow:
+                self._write_details_csv(detail_rows)
+
+            # Write to Excel
+            self._write_workbook(summary_rows, excel_details)
+
+            if overflow:
+                print(f"⚠️  {len(detail_rows):,} flag details exceed {MAX_EXCEL_ROWS:,} rows; "
+                      f"details saved to: {self.details_csv_path}")
+            elif self.details_csv_path.exists():
+                # Details fit in the workbook again (e.g. limit raised)
+                self.details_csv_path.unlink()
 
             print(f"✅ Flags saved to: {self.excel_path}")
 
         except Exception as e:
             print(f"❌ Failed to save flags: {e}")
 
+    def _write_workbook(self, summary_rows: List[Dict[str, Any]],
+                        detail_rows: List[Dict[str, Any]]):
+        """
+        Write both sheets to a temporary file beside the workbook and swap it
+        in once complete, so a failed write leaves the existing log intact.
+        """
+        tmp_path = self.excel_path.with_name(
+            f"{self.excel_path.stem}.tmp{self.excel_path.suffix}"
+        )
+        try:
+            if HAS_XLSXWRITER:
+                self._write_xlsxwriter(summary_rows, detail_rows, tmp_path)
+            else:
+                self._write_openpyxl(summary_rows, detail_rows, tmp_path)
+            os.replace(tmp_path, self.excel_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _write_details_csv(self, detail_rows: List[Dict[str, Any]]):
+        """
+        Stream the details log to the overflow CSV, via a temporary file so
+        a failed write leaves any previous CSV intact.
+        """
+        tmp_path = self.details_csv_path.with_name(
+            f"{self.details_csv_path.stem}.tmp{self.details_csv_path.suffix}"
+        )
+        try:
+            with open(tmp_path, 'w', newline='', encoding='utf-8',
+                      buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(DETAIL_COLUMNS)
+                writer.writerows(
+                    [row.get(col) for col in DETAIL_COLUMNS] for row in detail_rows
+                )
+            os.replace(tmp_path, self.details_csv_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _write_openpyxl(self, summary_rows: List[Dict[str, Any]],
+                        detail_rows: List[Dict[str, Any]], path: Path):
+        """Write both sheets with openpyxl in write-only (streaming) mode."""
+        # Write-only mode streams each row straight to the sheet XML instead
+        # of building a Cell object per value, so memory stays flat as the
+        # persistent details log grows.
+        wb = Workbook(write_only=True)
+
+        # Header formatting is registered once as a named style, so every
+        # header cell shares one style-table entry instead of carrying its
+        # own font/fill/border objects.
+        header_style = NamedStyle(
+            name='flag_log_header',
+            font=HEADER_FONT,
+            fill=HEADER_FILL,
+            border=HEADER_BORDER,
+        )
+        wb.add_named_style(header_style)
+
+        def header_cells(ws, columns):
+            cells = []
+            for col in columns:
+                cell = WriteOnlyCell(ws, value=col)
+                cell.style = 'flag_log_header'
+                cells.append(cell)
+            return cells
+
+        ws_summary = wb.create_sheet('Summary')
+        for letter, width in SUMMARY_WIDTHS:
+            ws_summary.column_dimensions[letter].width = width
+        ws_summary.append(header_cells(ws_summary, SUMMARY_COLUMNS))
+        for row in summary_rows:
+            ws_summary.append([row.get(col) for col in SUMMARY_COLUMNS])
+
+        ws_details = wb.create_sheet('Details')
+        for letter, width in DETAIL_WIDTHS:
+            ws_details.column_dimensions[letter].width = width
+        ws_details.append(header_cells(ws_details, DETAIL_COLUMNS))
+        for row in detail_rows:
+            ws_details.append([row.get(col) for col in DETAIL_COLUMNS])
+
+        wb.save(path)
+
+    def _write_xlsxwriter(self, summary_rows: List[Dict[str, Any]],
+                          detail_rows: List[Dict[str, Any]], path: Path):
+        """Write both sheets with XlsxWriter in constant-memory mode."""
+        wb = xlsxwriter.Workbook(str(path), {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+        })
+
+        # One Format object for all header cells, created outside the loops
+        header_fmt = wb.add_format({
+            'bold': True, 'bg_color': '#D9E1F2', 'bottom': 1,
+        })
+
+        ws_summary = wb.add_worksheet('Summary')
+        for letter, width in SUMMARY_WIDTHS:
+            ws_summary.set_column(f'{letter}:{letter}', width)
+        ws_summary.write_row(0, 0, SUMMARY_COLUMNS, header_fmt)
+        for r, row in enumerate(summary_rows, 1):
+            ws_summary.write_row(r, 0, [row.get(col) for col in SUMMARY_COLUMNS])
+
+        ws_details = wb.add_worksheet('Details')
+        for letter, width in DETAIL_WIDTHS:
+            ws_details.set_column(f'{letter}:{letter}', width)
+        ws_details.write_row(0, 0, DETAIL_COLUMNS, header_fmt)
+        for r, row in enumerate(detail_rows, 1):
+            ws_details.write_row(r, 0, [row.get(col) for col in DETAIL_COLUMNS])
+
+        # Closing is what writes the file; on an error above it is skipped
+        # and the exception reaches save()
+        wb.close()
+
     def get_student_flag_count(self, student_id: int) -> int:
         """
         Get total flag count for a student.
@@ -223,6 +414,6 @@ class FlagAggregator:
                 high_flag_students.append(summary)
 
         # Sort by total flags descending
-        high_flag_students.sort(key=lambda x: x.get('Total Flags', 0), reverse=True)
+        high_flag_students.sort(key=itemgetter('Total Flags'), reverse=True)
 
         return high_flag_students
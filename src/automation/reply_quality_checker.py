@@ -90,9 +90,9 @@ class OllamaReplyChecker:
         if r.status_code == 200:
             models = [m["name"] for m in r.json().get("models", [])]
             # Match model name with or without tag suffix
+            family = self.model.partition(":")[0]
             self._available = any(
-                m == self.model or m.startswith(self.model.split(":")[0])
-                for m in models
+                m == self.model or m.startswith(family) for m in models
             )
             if not self._available:
                 self.logger.warning(
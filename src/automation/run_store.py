@@ -1012,9 +1012,9 @@ class RunStore:
         import openpyxl
 
         rows = self.get_grading_with_aic(course_id, assignment_id)
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Grading Results"
+        # Write-only workbook: rows are serialized as they are appended
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Grading Results")
 
         if not rows:
             ws.append(["No results found"])
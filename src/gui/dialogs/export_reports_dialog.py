@@ -3,7 +3,7 @@ ExportReportsDialog — export AIC and grading data to PDF, Excel, or CSV.
 
 Format:
   PDF   — QTextDocument → QPdfWriter (no extra dependencies)
-  Excel — openpyxl via cohort data from RunStore
+  Excel — openpyxl via cohort data from RunStore (hidden if not installed)
   CSV   — standard csv module
 
 Scope:
@@ -19,6 +19,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFileDialog, QFrame, QMessageBox,
@@ -140,7 +146,10 @@ class ExportReportsDialog(QDialog):
         fmt_row = QHBoxLayout()
         fmt_row.setSpacing(SPACING_SM)
         self._fmt_chips: List[tuple[PhosphorChip, str]] = []
-        for label, key in [("PDF", "pdf"), ("Excel  .xlsx", "xlsx"), ("CSV", "csv")]:
+        formats = [("PDF", "pdf"), ("Excel  .xlsx", "xlsx"), ("CSV", "csv")]
+        if not HAS_OPENPYXL:
+            formats = [f for f in formats if f[1] != "xlsx"]
+        for label, key in formats:
             chip = PhosphorChip(label, active=(key == "pdf"))
             chip.toggled.connect(lambda checked, k=key: self._on_format_chip(k, checked))
             fmt_row.addWidget(chip)
@@ -280,13 +289,12 @@ class ExportReportsDialog(QDialog):
     # ── Export: Excel ─────────────────────────────────────────────────────────
 
     def _export_xlsx(self, out: str) -> None:
-        import openpyxl
-
-        wb = openpyxl.Workbook()
+        # Write-only mode streams rows to disk instead of holding every
+        # cell object in memory until save().
+        wb = openpyxl.Workbook(write_only=True)
 
         # Sheet 1: AIC cohort
-        ws = wb.active
-        ws.title = "AIC Results"
+        ws = wb.create_sheet("AIC Results")
         rows = self._get_cohort_rows()
         aic_headers = [
             "Student ID", "Student Name", "Engagement Depth", "Authenticity Score",
@@ -338,8 +346,7 @@ class ExportReportsDialog(QDialog):
         with open(out, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(display)
-            for r in rows:
-                writer.writerow([r.get(k) for k in keys])
+            writer.writerows([r.get(k) for k in keys] for r in rows)
 
     # ── Export: PDF ───────────────────────────────────────────────────────────
 
@@ -388,10 +395,15 @@ class ExportReportsDialog(QDialog):
         rows = self._get_cohort_rows()
         total = len(rows)
         counts: Dict[str, int] = {}
+        sg_count = 0
+        flagged: List[Dict] = []
         for r in rows:
             lvl = str(r.get("concern_level") or "none").lower()
             counts[lvl] = counts.get(lvl, 0) + 1
-        sg_count = sum(1 for r in rows if r.get("smoking_gun"))
+            if r.get("smoking_gun"):
+                sg_count += 1
+            if lvl in ("high", "moderate"):
+                flagged.append(r)
         pct = lambda n: f"{n / total * 100:.0f}%" if total else "—"
 
         _dist_label = {
@@ -412,9 +424,8 @@ class ExportReportsDialog(QDialog):
             f"<td>{r.get('concern_level', '—')}</td>"
             f"<td>{r.get('suspicious_score', '—')}</td>"
             f"<td>{'YES' if r.get('smoking_gun') else ''}</td></tr>"
-            for r in sorted(rows, key=lambda x: x.get("suspicious_score", 0) or 0,
+            for r in sorted(flagged, key=lambda x: x.get("suspicious_score", 0) or 0,
                             reverse=True)
-            if (r.get("concern_level") or "none").lower() in ("high", "moderate")
         )
 
         date_str = datetime.now().strftime("%B %d, %Y")
@@ -1394,12 +1394,15 @@ class RunWorker(CancellableWorker):
                     low = [r for r in results
                            if getattr(r, "concern_level", "") == "low"]
                     # Build highlights: top markers triggered across cohort
+                    # Counter consumes the generator in C; each student
+                    # contributes at most once per marker (students, not instances)
                     from collections import Counter
-                    all_markers = Counter()
-                    for r in results:
-                        for marker, cnt in getattr(r, "marker_counts", {}).items():
-                            if cnt > 0:
-                                all_markers[marker] += 1  # count students, not instances
+                    all_markers = Counter(
+                        marker
+                        for r in results
+                        for marker, cnt in getattr(r, "marker_counts", {}).items()
+                        if cnt > 0
+                    )
                     top_markers = [f"{name} ({cnt})"
                                    for name, cnt in all_markers.most_common(4)]
                     self.surface.emit("aic", {
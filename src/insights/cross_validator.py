@@ -251,6 +251,5 @@ class CrossValidator:
 
 def _extract_name(summary: str) -> str:
     """Extract the student name from a 'Name: details' summary string."""
-    if ":" in summary:
-        return summary.split(":")[0].strip()
-    return ""
+    name, sep, _ = summary.partition(":")
+    return name.strip() if sep else ""
@@ -244,10 +244,8 @@ def check_ollama_model(model: str, base_url: str = "http://localhost:11434") ->
         r = requests.get(f"{base_url}/api/tags", timeout=5)
         if r.status_code == 200:
             models = [m["name"] for m in r.json().get("models", [])]
-            return any(
-                m == model or m.startswith(model.split(":")[0])
-                for m in models
-            )
+            family = model.partition(":")[0]
+            return any(m == model or m.startswith(family) for m in models)
     except Exception:
         pass
     return False
@@ -24,6 +24,7 @@ import re
 import statistics
 from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from insights.models import (
@@ -120,6 +121,10 @@ _STOPWORDS = frozenset(
     "second third new also another".split()
 )
 
+# '!' and '?' -> '.', so text.translate(...).split('.') matches re.split(r'[.!?]+')
+# once empty pieces are filtered out.
+_SENTENCE_END = str.maketrans("!?", "..")
+
 
 def _strip_html(text: str) -> str:
     """Remove HTML tags from text."""
@@ -128,7 +133,11 @@ def _strip_html(text: str) -> str:
 
 def _tokenize(text: str) -> List[str]:
     """Simple word tokenization: lowercase, alpha-only, no stopwords."""
-    text = _strip_html(text)
+    return _tokenize_plain(_strip_html(text))
+
+
+def _tokenize_plain(text: str) -> List[str]:
+    """_tokenize for text that has already been through _strip_html."""
     words = re.findall(r"[a-zA-Z]{3,}", text.lower())
     return [w for w in words if w not in _STOPWORDS]
 
@@ -273,7 +282,7 @@ def _extract_key_concepts(description: str, top_n: int = 10) -> List[str]:
         return []
 
     # Split description into sentences as pseudo-documents for TF-IDF
-    sentences = [s.strip() for s in re.split(r'[.!?]+', description) if len(s.strip()) > 10]
+    sentences = [s.strip() for s in description.translate(_SENTENCE_END).split('.') if len(s.strip()) > 10]
 
     if len(sentences) >= 2:
         try:
@@ -323,6 +332,12 @@ def _detect_engagement_type(description: str) -> str:
         return "mixed"
 
 
+@lru_cache(maxsize=1024)
+def _word_boundary_re(term: str) -> "re.Pattern":
+    """Compiled ``\\b<term>\\b`` pattern; fingerprint terms recur for every submission."""
+    return re.compile(r'\b' + re.escape(term) + r'\b')
+
+
 def match_submission_references(
     submission_text: str,
     fingerprint: AssignmentFingerprint,
@@ -349,7 +364,7 @@ def match_submission_references(
             if len(parts) > 1 and parts[-1].lower() in text_lower:
                 # Verify it's a word boundary match, not a substring
                 last = parts[-1].lower()
-                if re.search(r'\b' + re.escape(last) + r'\b', text_lower):
+                if _word_boundary_re(last).search(text_lower):
                     authors_found.append(author)
 
     # Match work titles (case-insensitive, allow partial for long titles)
@@ -362,7 +377,7 @@ def match_submission_references(
             # For long titles, check if significant portion appears
             title_words = [w for w in title_lower.split() if w not in _STOPWORDS and len(w) > 2]
             if title_words:
-                found_count = sum(1 for w in title_words if re.search(r'\b' + re.escape(w) + r'\b', text_lower))
+                found_count = sum(1 for w in title_words if _word_boundary_re(w).search(text_lower))
                 if found_count / len(title_words) >= 0.6:
                     titles_found.append(title)
 
@@ -370,7 +385,7 @@ def match_submission_references(
     concepts_found = []
     for concept in fingerprint.key_concepts:
         concept_lower = concept.lower()
-        if re.search(r'\b' + re.escape(concept_lower) + r'\b', text_lower):
+        if _word_boundary_re(concept_lower).search(text_lower):
             concepts_found.append(concept)
 
     # Compute overall match ratio
@@ -874,8 +889,9 @@ class QuickAnalyzer:
         self, texts: Dict[str, str], top_n: int = 30
     ) -> List[TermFrequency]:
         counter: Counter = Counter()
+        # Bodies in `texts` were HTML-stripped once at intake
         for body in texts.values():
-            counter.update(_tokenize(body))
+            counter.update(_tokenize_plain(body))
         return [
             TermFrequency(term=t, count=c)
             for t, c in counter.most_common(top_n)
@@ -961,35 +977,35 @@ class QuickAnalyzer:
     def _keyword_hits(
         self, texts: Dict[str, str], meta: Dict[str, Dict]
     ) -> Dict[str, KeywordHit]:
-        hits: Dict[str, Dict] = {}
+        # Per-pattern record: [count, student_ids, examples]
+        hits: Dict[str, list] = {}
 
         for sid, body in texts.items():
             for pname, pattern in INSIGHT_PATTERNS.items():
                 matches = pattern.findall(body)
                 if not matches:
                     continue
-                if pname not in hits:
-                    hits[pname] = {
-                        "pattern_name": pname,
-                        "count": 0,
-                        "student_ids": [],
-                        "examples": [],
-                    }
-                hits[pname]["count"] += len(matches)
-                hits[pname]["student_ids"].append(sid)
+                rec = hits.get(pname)
+                if rec is None:
+                    rec = hits[pname] = [0, [], []]
+                rec[0] += len(matches)
+                rec[1].append(sid)
                 # Keep first example per student (up to 5 total)
-                if len(hits[pname]["examples"]) < 5:
+                examples = rec[2]
+                if len(examples) < 5:
                     # Find the match in context (±30 chars)
                     m = pattern.search(body)
                     if m:
                         start = max(0, m.start() - 30)
                         end = min(len(body), m.end() + 30)
-                        hits[pname]["examples"].append(
+                        examples.append(
                             "…" + body[start:end].strip() + "…"
                         )
 
         return {
-            name: KeywordHit(**data) for name, data in hits.items()
+            name: KeywordHit(pattern_name=name, count=count,
+                             student_ids=student_ids, examples=examples)
+            for name, (count, student_ids, examples) in hits.items()
         }
 
     # ------------------------------------------------------------------
@@ -1238,7 +1254,12 @@ class QuickAnalyzer:
 
         try:
             model = SentenceTransformer("all-MiniLM-L6-v2")
-            embeddings = model.encode(docs, show_progress_bar=False)
+            # Copy-pasted submissions share one encode; rows are expanded
+            # back so the matrix still lines up with sids.
+            doc_index: Dict[str, int] = {}
+            row_of = [doc_index.setdefault(d, len(doc_index)) for d in docs]
+            unique_embeddings = model.encode(list(doc_index), show_progress_bar=False)
+            embeddings = np.asarray(unique_embeddings)[row_of]
 
             # Choose k: sqrt(n) capped at 8
             n = len(docs)
@@ -1262,7 +1283,7 @@ class QuickAnalyzer:
 
                 # Top terms for this cluster
                 cluster_text = " ".join(texts[sid] for sid in c_sids)
-                top = Counter(_tokenize(cluster_text)).most_common(5)
+                top = Counter(_tokenize_plain(cluster_text)).most_common(5)
 
                 # Find submission closest to cluster centroid
                 centroid = km.cluster_centers_[cid]
@@ -1333,23 +1354,23 @@ class QuickAnalyzer:
 
         try:
             n = len(sids)
-            sim_matrix = cosine_similarity(embeddings)  # (n, n) symmetric
+            # float32 in → float32 (n, n) symmetric matrix out, half the
+            # memory of sklearn's float64 default on large classes
+            sim_matrix = cosine_similarity(np.asarray(embeddings, dtype=np.float32))
 
             # Collect upper-triangle values (exclude self-similarity on diagonal)
-            upper = [
-                float(sim_matrix[i, j])
-                for i in range(n)
-                for j in range(i + 1, n)
-            ]
+            # with one vectorized gather instead of an O(n^2) Python loop.
+            rows_i, cols_j = np.triu_indices(n, k=1)
+            upper = np.asarray(sim_matrix)[rows_i, cols_j]
 
-            if not upper:
+            if upper.size == 0:
                 return None
 
-            total_pairs = len(upper)
-            mean_sim = float(np.mean(upper))
-            max_sim = float(np.max(upper))
-            pairs_085 = int(sum(1 for v in upper if v >= 0.85))
-            pairs_070 = int(sum(1 for v in upper if v >= 0.70))
+            total_pairs = int(upper.size)
+            mean_sim = float(upper.mean())
+            max_sim = float(upper.max())
+            pairs_085 = int(np.count_nonzero(upper >= 0.85))
+            pairs_070 = int(np.count_nonzero(upper >= 0.70))
 
             # Build a class-level observation note — no student names or pair IDs
             if mean_sim >= 0.80:
@@ -1388,33 +1409,32 @@ class QuickAnalyzer:
             high_pairs: List[HighSimilarityPair] = []
             INDIVIDUAL_THRESHOLD = 0.90
             if meta is not None:
-                for i in range(n):
-                    for j in range(i + 1, n):
-                        sim = float(sim_matrix[i, j])
-                        if sim >= INDIVIDUAL_THRESHOLD:
-                            name_a = meta.get(
-                                sids[i], {}
-                            ).get("student_name", f"Student {sids[i]}")
-                            name_b = meta.get(
-                                sids[j], {}
-                            ).get("student_name", f"Student {sids[j]}")
-                            high_pairs.append(HighSimilarityPair(
-                                student_id_a=sids[i],
-                                student_name_a=name_a,
-                                student_id_b=sids[j],
-                                student_name_b=name_b,
-                                cosine_similarity=round(sim, 4),
-                                observation=(
-                                    f"These two submissions share "
-                                    f"{sim:.0%} vocabulary overlap. "
-                                    f"This is a factual observation — "
-                                    f"the system does not determine "
-                                    f"cause. Possible interpretations "
-                                    f"include shared source material, "
-                                    f"collaborative learning, or "
-                                    f"identical content."
-                                ),
-                            ))
+                for k in np.flatnonzero(upper >= INDIVIDUAL_THRESHOLD):
+                    i, j = int(rows_i[k]), int(cols_j[k])
+                    sim = float(upper[k])
+                    name_a = meta.get(
+                        sids[i], {}
+                    ).get("student_name", f"Student {sids[i]}")
+                    name_b = meta.get(
+                        sids[j], {}
+                    ).get("student_name", f"Student {sids[j]}")
+                    high_pairs.append(HighSimilarityPair(
+                        student_id_a=sids[i],
+                        student_name_a=name_a,
+                        student_id_b=sids[j],
+                        student_name_b=name_b,
+                        cosine_similarity=round(sim, 4),
+                        observation=(
+                            f"These two submissions share "
+                            f"{sim:.0%} vocabulary overlap. "
+                            f"This is a factual observation — "
+                            f"the system does not determine "
+                            f"cause. Possible interpretations "
+                            f"include shared source material, "
+                            f"collaborative learning, or "
+                            f"identical content."
+                        ),
+                    ))
 
             return PairwiseSimilarityStats(
                 mean_similarity=round(mean_sim, 4),
@@ -1737,7 +1757,8 @@ class QuickAnalyzer:
 
         for sid, body in texts.items():
             # Split into sentences — rough but sufficient
-            sentences = [s.strip() for s in re.split(r"[.!?]+", body)
+            sentences = [s.strip()
+                         for s in body.translate(_SENTENCE_END).split(".")
                          if len(s.strip()) > 15]
             if not sentences:
                 continue
@@ -11,6 +11,7 @@ Wellbeing classification (4-axis) runs as a separate stage on raw submissions.
 
 import json
 import logging
+from collections import Counter
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
@@ -482,7 +483,7 @@ def code_submission(
     _backend = quick_summary.sentiment_backend if quick_summary else ""
     _emotions_dict = quick_summary.emotions if quick_summary else {}
     if _backend == "go_emotions" and _reliability_tier != "suppressed" and _emotions_dict:
-        _top3 = sorted(_emotions_dict.items(), key=lambda kv: kv[1], reverse=True)[:3]
+        _top3 = Counter(_emotions_dict).most_common(3)
         top_emotions_str = (
             "\n  Named emotions: "
             + ", ".join(f"{label} ({score:.2f})" for label, score in _top3)
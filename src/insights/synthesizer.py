@@ -13,6 +13,7 @@ Students to Check In With.
 
 import json
 import logging
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
 from insights.llm_backend import BackendConfig, parse_json_response, send_text
@@ -626,7 +627,7 @@ def guided_synthesis(
                 concern_type_counts[label] = concern_type_counts.get(label, 0) + 1
         if concern_type_counts:
             concern_types_str = "; ".join(
-                f"{k} ({v})" for k, v in list(concern_type_counts.items())[:5]
+                f"{k} ({v})" for k, v in islice(concern_type_counts.items(), 5)
             )
         else:
             concern_types_str = "none"
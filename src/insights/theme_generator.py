@@ -295,6 +295,7 @@ def _embedding_dedup_themes(theme_set: ThemeSet, threshold: float = 0.85) -> The
     try:
         from sentence_transformers import SentenceTransformer, util as st_util
         import torch
+        import numpy as np
     except ImportError:
         log.debug("sentence-transformers not available — skipping embedding dedup")
         return theme_set
@@ -303,20 +304,27 @@ def _embedding_dedup_themes(theme_set: ThemeSet, threshold: float = 0.85) -> The
         model = SentenceTransformer("all-MiniLM-L6-v2")
         texts = [f"{t.name}: {t.description}" for t in theme_set.themes]
         embeddings = model.encode(texts, convert_to_tensor=True, show_progress_bar=False)
-        cosine_scores = st_util.cos_sim(embeddings, embeddings)
+        # Pull the score matrix into NumPy once, staying float32 rather than
+        # boxing every pair as a Python float.
+        cosine_scores = st_util.cos_sim(embeddings, embeddings).cpu().numpy()
+
+        # Threshold the whole upper triangle at once; only pairs that clear
+        # it reach the merge loop (argwhere yields them in row-major order).
+        candidates: dict = {}  # row index → candidate column indices
+        for i, j in np.argwhere(np.triu(cosine_scores >= threshold, k=1)).tolist():
+            candidates.setdefault(i, []).append(j)
 
         merged_into: dict = {}  # index → canonical index
-        for i in range(len(theme_set.themes)):
+        for i, cols in candidates.items():
             if i in merged_into:
                 continue
-            for j in range(i + 1, len(theme_set.themes)):
+            for j in cols:
                 if j in merged_into:
                     continue
-                if cosine_scores[i][j].item() >= threshold:
-                    # Keep the higher-frequency theme as canonical
-                    canonical = i if theme_set.themes[i].frequency >= theme_set.themes[j].frequency else j
-                    duplicate = j if canonical == i else i
-                    merged_into[duplicate] = canonical
+                # Keep the higher-frequency theme as canonical
+                canonical = i if theme_set.themes[i].frequency >= theme_set.themes[j].frequency else j
+                duplicate = j if canonical == i else i
+                merged_into[duplicate] = canonical
 
         if not merged_into:
             return theme_set
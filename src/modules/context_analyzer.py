@@ -4,6 +4,7 @@ Population-aware adjustments for diverse student populations.
 Reduces false positives for ESL, first-generation, and neurodivergent students.
 """
 
+import re
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -15,6 +16,11 @@ try:
 except ImportError:
     HAS_YAML = False
 
+# Paragraph-opening words that mark a formulaic five-paragraph structure
+_TRANSITION_STARTERS = frozenset({
+    'firstly', 'secondly', 'thirdly', 'furthermore', 'moreover', 'additionally'
+})
+
 
 @dataclass
 class ContextAdjustment:
@@ -104,6 +110,14 @@ class ContextAnalyzer:
             context_profile_path: Path to YAML context profile
         """
         self.profile = self._load_profile(context_profile_path)
+
+        # Compile the profile's ESL patterns once; invalid ones are skipped
+        self._esl_patterns: List[Tuple[str, re.Pattern]] = []
+        for pattern in self.profile.get('esl_error_patterns', self.DEFAULT_PROFILE['esl_error_patterns']):
+            try:
+                self._esl_patterns.append((pattern, re.compile(pattern, re.IGNORECASE)))
+            except re.error:
+                pass
     
     def _load_profile(self, profile_path: Optional[Path]) -> Dict:
         """Load context profile from YAML or use defaults."""
@@ -129,19 +143,11 @@ class ContextAnalyzer:
         Returns:
             ContextAnalysisResult with adjustments and explanations
         """
-        import re
-        
         # Start with known context or create new
         context = known_context or StudentContext()
         
         # Detect ESL patterns in text
-        esl_patterns_found = []
-        for pattern in self.profile.get('esl_error_patterns', self.DEFAULT_PROFILE['esl_error_patterns']):
-            try:
-                if re.search(pattern, text, re.IGNORECASE):
-                    esl_patterns_found.append(pattern)
-            except re.error:
-                pass
+        esl_patterns_found = [pattern for pattern, regex in self._esl_patterns if regex.search(text)]
         
         if esl_patterns_found:
             context.has_esl_error_patterns = True
@@ -247,10 +253,11 @@ class ContextAnalyzer:
                 patterns_found.append('formulaic_conclusion')
         
         # Check for explicit transition words at paragraph starts
-        transition_starters = ['firstly', 'secondly', 'thirdly', 'furthermore', 'moreover', 'additionally']
         for para in paragraphs[1:-1] if len(paragraphs) > 2 else []:
-            first_word = para.split()[0].lower() if para.split() else ''
-            if first_word.rstrip(',') in transition_starters:
+            # Split off just the first word rather than tokenizing the paragraph
+            words = para.split(None, 1)
+            first_word = words[0].lower() if words else ''
+            if first_word.rstrip(',') in _TRANSITION_STARTERS:
                 patterns_found.append('explicit_paragraph_transition')
                 break
         
@@ -4,10 +4,23 @@ Compares draft and final submissions to detect suspicious revision patterns.
 """
 
 import re
+import sys
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 
+# Patterns used on every draft/final pair, compiled once
+_WHITESPACE_RUN = re.compile(r'\s+')
+_NON_WORD = re.compile(r'[^\w\s]')
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n|\n{2,}')
+_SENTENCE_END = re.compile(r'[.!?]+')
+_FIRST_PERSON = re.compile(r'\b(I|my|me)\b', re.I)
+_DOUBLE_SPACE = re.compile(r'  +')
+_MISSING_SPACE = re.compile(r'[.!?,][A-Za-z]')
+_COMMON_TYPOS = re.compile(
+    r'\b(?:' + '|'.join(['teh', 'hte', 'adn', 'taht', 'wiht']) + r')\b', re.I
+)
+
 
 @dataclass
 class RevisionAnalysis:
@@ -80,12 +93,21 @@ class DraftComparisonAnalyzer:
         draft_clean = self._normalize_text(draft_text)
         final_clean = self._normalize_text(final_text)
         
-        # Word-level analysis
-        draft_words = draft_clean.split()
-        final_words = final_clean.split()
+        # Word-level analysis. Tokens are interned so the many repeated words
+        # shared by both drafts become one object each; set building and the
+        # word-level SequenceMatcher then compare by identity first.
+        draft_words = [sys.intern(w) for w in draft_clean.split()]
+        final_words = [sys.intern(w) for w in final_clean.split()]
+        
+        # A resubmitted draft normalizes to the same string; skip the
+        # edit-distance passes, whose results are fixed for equal inputs.
+        unchanged = bool(draft_clean) and draft_clean == final_clean
         
         # Calculate similarity
-        overall_sim = self._calculate_similarity(draft_clean, final_clean)
+        if unchanged:
+            overall_sim = 1.0
+        else:
+            overall_sim = self._calculate_similarity(draft_clean, final_clean)
         
         # Paragraph analysis
         draft_paragraphs = self._get_paragraphs(draft_text)
@@ -98,7 +120,10 @@ class DraftComparisonAnalyzer:
         content_overlap = self._calculate_content_overlap(draft_words, final_words)
         
         # Count changes
-        added, removed, changed = self._count_word_changes(draft_words, final_words)
+        if unchanged:
+            added = removed = changed = 0
+        else:
+            added, removed, changed = self._count_word_changes(draft_words, final_words)
         para_added, para_removed = self._count_paragraph_changes(
             draft_paragraphs, final_paragraphs
         )
@@ -153,15 +178,15 @@ class DraftComparisonAnalyzer:
         # Lowercase
         text = text.lower()
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RUN.sub(' ', text)
         # Remove punctuation for word comparison
-        text = re.sub(r'[^\w\s]', '', text)
+        text = _NON_WORD.sub('', text)
         return text.strip()
     
     def _get_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs."""
         # Split on double newlines or single newlines with blank lines
-        paragraphs = re.split(r'\n\s*\n|\n{2,}', text)
+        paragraphs = _PARAGRAPH_BREAK.split(text)
         # Clean and filter empty
         return [p.strip() for p in paragraphs if p.strip()]
     
@@ -203,9 +228,10 @@ class DraftComparisonAnalyzer:
             return 0.0
         
         set1 = set(words1)
-        set2 = set(words2)
         
-        overlap = len(set1 & set2)
+        # Probe the final's words against the draft set directly rather
+        # than building a second set just to intersect it.
+        overlap = len(set1.intersection(words2))
         return overlap / len(set1)
     
     def _count_word_changes(self, 
@@ -215,8 +241,11 @@ class DraftComparisonAnalyzer:
         set1 = set(words1)
         set2 = set(words2)
         
-        added = len(set2 - set1)
-        removed = len(set1 - set2)
+        # Only the sizes of the differences are needed, so derive them from
+        # the intersection instead of materializing both difference sets.
+        shared = len(set1 & set2)
+        added = len(set2) - shared
+        removed = len(set1) - shared
         
         # Estimate changed (words in similar positions that differ)
         matcher = SequenceMatcher(None, words1, words2)
@@ -243,31 +272,57 @@ class DraftComparisonAnalyzer:
                                  paras2: List[str]) -> List[str]:
         """Identify major structural or content changes."""
         changes = []
-        
+        threshold = 0.3
+
+        lower1 = [p.lower() for p in paras1]
+        lower2 = [p.lower() for p in paras2]
+
+        def has_match(text: str, candidates: List[str], text_is_draft: bool) -> bool:
+            # Any paragraph pair scoring >= threshold is enough. The ratio can
+            # never exceed 2*min(len)/(len1+len2), so pairs whose lengths are too
+            # far apart are skipped before running SequenceMatcher. quick_ratio()
+            # bounds it by the shared character multiset, which prunes most
+            # unrelated pairs before the full matching-blocks pass.
+            # SequenceMatcher is not symmetric, so the draft paragraph is always
+            # passed first whichever side is being checked.
+            for other in candidates:
+                total = len(text) + len(other)
+                if not total or 2 * min(len(text), len(other)) / total < threshold:
+                    continue
+                if text_is_draft:
+                    matcher = SequenceMatcher(None, text, other)
+                else:
+                    matcher = SequenceMatcher(None, other, text)
+                if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
+                    return True
+            return False
+
+        # Paragraphs carried over verbatim always match; only the rest need
+        # fuzzy scoring.
+        set1, set2 = set(lower1), set(lower2)
+        draft_matched = [text in set2 for text in lower1]
+        final_matched = [text in set1 for text in lower2]
+
+        if not (all(draft_matched) and all(final_matched)):
+            draft_matched = [hit or has_match(text, lower2, True)
+                             for text, hit in zip(lower1, draft_matched)]
+            final_matched = [hit or has_match(text, lower1, False)
+                             for text, hit in zip(lower2, final_matched)]
+
         # Compare each draft paragraph to final
         for i, p1 in enumerate(paras1):
-            best_match = 0
-            for p2 in paras2:
-                sim = SequenceMatcher(None, p1.lower(), p2.lower()).ratio()
-                best_match = max(best_match, sim)
-            
-            if best_match < 0.3:
+            if not draft_matched[i]:
                 preview = p1[:50] + "..." if len(p1) > 50 else p1
                 changes.append(f"Draft paragraph {i+1} removed or heavily rewritten: '{preview}'")
-        
+
         # Check for new paragraphs
         for i, p2 in enumerate(paras2):
-            best_match = 0
-            for p1 in paras1:
-                sim = SequenceMatcher(None, p1.lower(), p2.lower()).ratio()
-                best_match = max(best_match, sim)
-            
-            if best_match < 0.3:
+            if not final_matched[i]:
                 preview = p2[:50] + "..." if len(p2) > 50 else p2
                 changes.append(f"New paragraph {i+1} in final: '{preview}'")
-        
+
         return changes
-    
+
     def _assess_concern(self,
                         overall_sim: float,
                         structural_sim: float,
@@ -296,8 +351,10 @@ class DraftComparisonAnalyzer:
                 concerns.append(f"Final is much shorter than draft ({length_ratio:.1f}x)")
         
         # Check for sophistication jump (crude heuristic)
-        draft_avg_word_len = sum(len(w) for w in draft_text.split()) / max(len(draft_text.split()), 1)
-        final_avg_word_len = sum(len(w) for w in final_text.split()) / max(len(final_text.split()), 1)
+        draft_tokens = draft_text.split()
+        final_tokens = final_text.split()
+        draft_avg_word_len = sum(map(len, draft_tokens)) / max(len(draft_tokens), 1)
+        final_avg_word_len = sum(map(len, final_tokens)) / max(len(final_tokens), 1)
         
         if final_avg_word_len > draft_avg_word_len + 1.5:
             concerns.append("Vocabulary sophistication increased significantly")
@@ -335,14 +392,14 @@ class DraftComparisonAnalyzer:
             signs.append("Paragraph structure refined (not completely changed)")
         
         # Check for expansion of ideas (sentences added within paragraphs)
-        draft_sentences = len(re.findall(r'[.!?]+', draft))
-        final_sentences = len(re.findall(r'[.!?]+', final))
+        draft_sentences = len(_SENTENCE_END.findall(draft))
+        final_sentences = len(_SENTENCE_END.findall(final))
         if 1.2 < final_sentences / max(draft_sentences, 1) < 2.0:
             signs.append("Ideas expanded (moderate sentence increase)")
         
         # Check for consistent voice (I/my usage patterns)
-        draft_first_person = len(re.findall(r'\b(I|my|me)\b', draft, re.I))
-        final_first_person = len(re.findall(r'\b(I|my|me)\b', final, re.I))
+        draft_first_person = len(_FIRST_PERSON.findall(draft))
+        final_first_person = len(_FIRST_PERSON.findall(final))
         if draft_first_person > 0 and final_first_person > 0:
             ratio = final_first_person / draft_first_person
             if 0.5 < ratio < 2.0:
@@ -355,15 +412,13 @@ class DraftComparisonAnalyzer:
         errors = 0
         
         # Double spaces
-        errors += len(re.findall(r'  +', text))
+        errors += len(_DOUBLE_SPACE.findall(text))
         
         # Missing space after punctuation
-        errors += len(re.findall(r'[.!?,][A-Za-z]', text))
+        errors += len(_MISSING_SPACE.findall(text))
         
-        # Common typos (very basic)
-        common_typos = ['teh', 'hte', 'adn', 'taht', 'wiht']
-        for typo in common_typos:
-            errors += len(re.findall(rf'\b{typo}\b', text, re.I))
+        # Common typos (very basic), all counted in one scan
+        errors += len(_COMMON_TYPOS.findall(text))
         
         return errors
     
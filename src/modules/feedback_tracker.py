@@ -8,6 +8,7 @@ Allows instructors to record outcomes of flagged submissions to:
 """
 
 import csv
+from collections import Counter, defaultdict
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict
@@ -92,9 +93,10 @@ class FeedbackTracker:
         """
         try:
             # Append to CSV
+            row = asdict(record)
             with open(self.feedback_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=asdict(record).keys())
-                writer.writerow(asdict(record))
+                writer = csv.DictWriter(f, fieldnames=row.keys())
+                writer.writerow(row)
             return True
         except Exception as e:
             print(f"⚠ Warning: Could not save feedback: {e}")
@@ -144,16 +146,10 @@ class FeedbackTracker:
                 "outcomes": {}
             }
 
-        total = 0
-        outcomes = {}
-
         try:
             with open(self.feedback_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    total += 1
-                    outcome = row['outcome']
-                    outcomes[outcome] = outcomes.get(outcome, 0) + 1
+                outcomes = Counter(row['outcome'] for row in csv.DictReader(f))
+            total = sum(outcomes.values())
 
             false_positives = outcomes.get('false_positive', 0)
             confirmed = outcomes.get('confirmed_concern', 0)
@@ -162,7 +158,7 @@ class FeedbackTracker:
                 "total_records": total,
                 "false_positive_rate": (false_positives / total * 100) if total > 0 else 0.0,
                 "confirmed_rate": (confirmed / total * 100) if total > 0 else 0.0,
-                "outcomes": outcomes
+                "outcomes": dict(outcomes)
             }
         except Exception as e:
             print(f"⚠ Warning: Could not calculate statistics: {e}")
@@ -271,8 +267,9 @@ class FeedbackTracker:
         if not self.feedback_file.exists():
             return {}
 
-        marker_stats = {}
-        # Track: for each marker, how often was it present in confirmed vs false positive cases
+        # Outcome tallies per marker: how often each marker was present in
+        # confirmed vs false positive cases
+        marker_outcomes: Dict[str, Counter] = defaultdict(Counter)
 
         try:
             with open(self.feedback_file, 'r', encoding='utf-8') as f:
@@ -286,18 +283,19 @@ class FeedbackTracker:
                     except:
                         markers = {}
 
-                    for marker_type, count in markers.items():
-                        if marker_type not in marker_stats:
-                            marker_stats[marker_type] = {
-                                'confirmed': 0,
-                                'false_positive': 0,
-                                'needs_revision': 0,
-                                'uncertain': 0,
-                                'total': 0
-                            }
-
-                        marker_stats[marker_type][outcome] += 1
-                        marker_stats[marker_type]['total'] += 1
+                    for marker_type in markers:
+                        marker_outcomes[marker_type][outcome] += 1
+
+            marker_stats = {}
+            for marker_type, counts in marker_outcomes.items():
+                marker_stats[marker_type] = {
+                    # Recorded outcome is 'confirmed_concern'
+                    'confirmed': counts['confirmed_concern'] + counts['confirmed'],
+                    'false_positive': counts['false_positive'],
+                    'needs_revision': counts['needs_revision'],
+                    'uncertain': counts['uncertain'],
+                    'total': sum(counts.values())
+                }
 
             # Calculate effectiveness metrics
             for marker_type in marker_stats:
@@ -15,12 +15,12 @@ Paradigm shift: From "Does this look like AI?" to "Does this show a human mind a
 import math
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 # Try to import marker loader
 try:
-    from modules.marker_loader import MarkerLoader
+    from modules.marker_loader import get_shared_marker_loader
     HAS_MARKER_LOADER = True
 except ImportError:
     HAS_MARKER_LOADER = False
@@ -275,19 +275,27 @@ _BUILTIN_PATTERNS: Dict[str, List[Tuple[str, bool, float]]] = {
 }
 
 
-def _compile_builtin_patterns() -> Dict[str, List[Tuple[re.Pattern, float]]]:
-    """Pre-compile built-in fallback patterns (called once at import)."""
-    compiled: Dict[str, List[Tuple[re.Pattern, float]]] = {}
+def _compile_builtin_patterns() -> Dict[str, List[Tuple[re.Pattern, float, Optional[str]]]]:
+    """
+    Pre-compile built-in fallback patterns (called once at import).
+
+    Literal phrases also carry their lowercased text as a substring
+    prefilter; regex patterns carry None.
+    """
+    compiled: Dict[str, List[Tuple[re.Pattern, float, Optional[str]]]] = {}
     for category_id, pattern_list in _BUILTIN_PATTERNS.items():
-        compiled_list: List[Tuple[re.Pattern, float]] = []
+        compiled_list: List[Tuple[re.Pattern, float, Optional[str]]] = []
         for pattern_str, is_regex, weight in pattern_list:
             try:
+                needle = None
                 if is_regex:
                     regex = re.compile(pattern_str, re.IGNORECASE)
                 else:
                     escaped = re.escape(pattern_str)
                     regex = re.compile(rf'\b{escaped}\b', re.IGNORECASE)
-                compiled_list.append((regex, weight))
+                    if pattern_str.isascii():
+                        needle = pattern_str.lower()
+                compiled_list.append((regex, weight, needle))
             except re.error:
                 pass  # Skip invalid patterns
         compiled[category_id] = compiled_list
@@ -296,6 +304,15 @@ def _compile_builtin_patterns() -> Dict[str, List[Tuple[re.Pattern, float]]]:
 
 _COMPILED_BUILTINS = _compile_builtin_patterns()
 
+# Display names for CategoryScore.category_name
+_CATEGORY_NAMES: Dict[str, str] = {
+    'authentic_voice': 'Authentic Voice',
+    'productive_messiness': 'Productive Messiness',
+    'cognitive_struggle': 'Cognitive Struggle',
+    'emotional_stakes': 'Emotional Stakes',
+    'contextual_grounding': 'Contextual Grounding'
+}
+
 # ---------------------------------------------------------------------------
 # Expected raw-score midpoints per category for calibration.
 # These are the raw_score values at which a category should read ~50%
@@ -385,15 +402,17 @@ class HumanPresenceDetector:
         self._yaml_load_failed = False
 
         if HAS_MARKER_LOADER:
-            self.marker_loader = MarkerLoader(config_dir)
+            self.marker_loader = get_shared_marker_loader(config_dir)
 
-    def analyze(self, text: str, assignment_type: Optional[str] = None) -> HumanPresenceResult:
+    def analyze(self, text: str, assignment_type: Optional[str] = None,
+                word_count: Optional[int] = None) -> HumanPresenceResult:
         """
         Analyze text for human presence markers.
 
         Args:
             text: The text to analyze
             assignment_type: Optional assignment type for context adjustments
+            word_count: len(text.split()), if the caller already has it
 
         Returns:
             HumanPresenceResult with comprehensive analysis
@@ -401,14 +420,19 @@ class HumanPresenceDetector:
         if not text or not text.strip():
             return self._create_empty_result()
 
-        word_count = len(text.split())
+        if word_count is None:
+            word_count = len(text.split())
+
+        # One pass over the text finds every literal YAML phrase for all five
+        # categories; only regex patterns are still run per category
+        literal_hits = self._scan_literals(text)
 
         # Analyze each category
-        authentic_voice = self._analyze_category(text, 'authentic_voice', assignment_type, word_count)
-        productive_messiness = self._analyze_category(text, 'productive_messiness', assignment_type, word_count)
-        cognitive_struggle = self._analyze_category(text, 'cognitive_struggle', assignment_type, word_count)
-        emotional_stakes = self._analyze_category(text, 'emotional_stakes', assignment_type, word_count)
-        contextual_grounding = self._analyze_category(text, 'contextual_grounding', assignment_type, word_count)
+        authentic_voice = self._analyze_category(text, 'authentic_voice', assignment_type, word_count, literal_hits)
+        productive_messiness = self._analyze_category(text, 'productive_messiness', assignment_type, word_count, literal_hits)
+        cognitive_struggle = self._analyze_category(text, 'cognitive_struggle', assignment_type, word_count, literal_hits)
+        emotional_stakes = self._analyze_category(text, 'emotional_stakes', assignment_type, word_count, literal_hits)
+        contextual_grounding = self._analyze_category(text, 'contextual_grounding', assignment_type, word_count, literal_hits)
 
         # Calculate total score (0-100)
         total_score = (
@@ -473,9 +497,33 @@ class HumanPresenceDetector:
             analysis_notes=analysis_notes
         )
 
+    def _scan_literals(self, text: str) -> Optional[Tuple[Any, Optional[Dict], Any]]:
+        """
+        Scan text once for every literal YAML marker phrase.
+
+        Returns:
+            (literal_index, hits, ruled_out) for _analyze_category, or None
+            when the YAML markers or their literal index are unavailable.
+            When the one-pass scan cannot be used, hits is None and
+            ruled_out holds the phrases whose first character is absent.
+        """
+        if not (self.marker_loader and HAS_MARKER_LOADER and not self._yaml_load_failed):
+            return None
+        try:
+            literal_index = self.marker_loader.load_all_markers().literal_index
+            if literal_index is None:
+                return None
+            hits = literal_index.scan(text)
+            ruled_out = literal_index.ruled_out(text) if hits is None else ()
+        except Exception:
+            # _analyze_category reports the failure and falls back
+            return None
+        return literal_index, hits, ruled_out
+
     def _analyze_category(self, text: str, category_id: str,
                           assignment_type: Optional[str] = None,
-                          word_count: int = 0) -> CategoryScore:
+                          word_count: int = 0,
+                          literal_hits: Optional[Tuple[Any, Optional[Dict], Any]] = None) -> CategoryScore:
         """Analyze text for a specific category of markers."""
         markers_found: List[str] = []
         raw_score = 0.0
@@ -491,13 +539,23 @@ class HumanPresenceDetector:
 
                 if category_id in loaded_markers.compiled_patterns:
                     patterns = loaded_markers.compiled_patterns[category_id]
-                    for regex, weight, _confidence in patterns:
-                        matches = list(regex.finditer(text))
-                        if matches:
-                            marker_count += len(matches)
-                            raw_score += weight * len(matches)
-                            for match in matches[:3]:
-                                markers_found.append(match.group())
+                    literal_index, hits, ruled_out = literal_hits or (None, None, ())
+                    for i, (regex, weight, _confidence) in enumerate(patterns):
+                        if hits is not None and (category_id, i) in literal_index.keys:
+                            found = hits.get((category_id, i), ())
+                            count = len(found)
+                            markers_found.extend(matched for _pos, matched in found[:3])
+                        elif (category_id, i) in ruled_out:
+                            continue
+                        else:
+                            count = 0
+                            for match in regex.finditer(text):
+                                if count < 3:
+                                    markers_found.append(match.group())
+                                count += 1
+                        if count:
+                            marker_count += count
+                            raw_score += weight * count
                     used_yaml = True
             except Exception as e:
                 # Log the failure once so it isn't invisible, then fall back
@@ -510,13 +568,20 @@ class HumanPresenceDetector:
         # ------------------------------------------------------------------
         if not used_yaml:
             builtin = _COMPILED_BUILTINS.get(category_id, [])
-            for regex, weight in builtin:
-                matches = list(regex.finditer(text))
-                if matches:
-                    marker_count += len(matches)
-                    raw_score += weight * len(matches)
-                    for match in matches[:3]:
+            # Most phrases are absent from any one essay; for ASCII text a
+            # substring test rules them out without running the regex
+            text_lower = text.lower() if text.isascii() else None
+            for regex, weight, needle in builtin:
+                if needle is not None and text_lower is not None and needle not in text_lower:
+                    continue
+                count = 0
+                for match in regex.finditer(text):
+                    if count < 3:
                         markers_found.append(match.group())
+                    count += 1
+                if count:
+                    marker_count += count
+                    raw_score += weight * count
 
         # ------------------------------------------------------------------
         # Normalize raw score to 0-100 using calibrated logistic curve
@@ -527,18 +592,9 @@ class HumanPresenceDetector:
         weight = self.CATEGORY_WEIGHTS[category_id]
         weighted_score = normalized_score * weight
 
-        # Category names
-        category_names = {
-            'authentic_voice': 'Authentic Voice',
-            'productive_messiness': 'Productive Messiness',
-            'cognitive_struggle': 'Cognitive Struggle',
-            'emotional_stakes': 'Emotional Stakes',
-            'contextual_grounding': 'Contextual Grounding'
-        }
-
         return CategoryScore(
             category_id=category_id,
-            category_name=category_names[category_id],
+            category_name=_CATEGORY_NAMES[category_id],
             raw_score=round(raw_score, 2),
             weighted_score=round(weighted_score, 2),
             weight=weight,
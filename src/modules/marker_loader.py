@@ -5,18 +5,55 @@ Applies context and profile adjustments to marker weights.
 """
 
 import re
+import sys
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 # Try to import yaml
 try:
     import yaml
+    # libyaml's C parser is several times faster when PyYAML was built with it
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
 
 
+def _intern(value: Any) -> Any:
+    """sys.intern() strings loaded from YAML; leave anything else alone."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _load_yaml(path: Path) -> Any:
+    """Safe-load a YAML file, using the C loader when available."""
+    return yaml.load(path.read_bytes(), Loader=_YamlLoader)
+
+# Optional: pyahocorasick finds every literal phrase in one pass over the text
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+
+# Marker roles used by calculate_marker_scores.
+# AI-SPECIFIC markers - NEVER receive cognitive protection
+_AI_SPECIFIC_MARKERS = frozenset({'ai_specific_organization'})
+# OVERLAPPING markers - subject to cognitive protection when neurodivergent patterns present
+_OVERLAPPING_ORGANIZATIONAL_MARKERS = frozenset({
+    'ai_transitions', 'generic_phrases', 'hedge_phrases', 'inflated_vocabulary',
+})
+# All suspicious markers (for scoring)
+_SUSPICIOUS_MARKERS = _AI_SPECIFIC_MARKERS | _OVERLAPPING_ORGANIZATIONAL_MARKERS
+# Authenticity markers (presence is good)
+_AUTHENTICITY_MARKERS = frozenset({
+    'personal_voice_markers', 'balance_markers', 'emotional_language', 'cognitive_diversity_markers',
+})
+
+
 @dataclass
 class MarkerMatch:
     """A single marker match in text."""
@@ -35,6 +72,151 @@ class LoadedMarkers:
     compiled_patterns: Dict[str, List[Tuple[re.Pattern, float, str]]]  # marker_id -> [(pattern, weight, confidence)]
     context_multipliers: Dict[str, float]  # marker_id -> multiplier
     profile_multipliers: Dict[str, float]  # marker_id -> multiplier
+    literal_index: Optional["_LiteralIndex"] = None  # all non-regex phrases
+    clustering: Dict[str, Tuple[int, float]] = field(default_factory=dict)  # marker_id -> (threshold, boost)
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same character class as ``\\w`` for str patterns."""
+    return ch.isalnum() or ch == '_'
+
+
+def _at_word_boundary(text: str, pos: int) -> bool:
+    """True where ``\\b`` would match at ``pos`` in ``text``."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def _trie_alternation(phrases: List[str]) -> str:
+    """
+    Regex source matching any of ``phrases``, factored into a prefix trie.
+
+    SRE tries alternatives one at a time, so a flat ``p1|p2|...`` costs a
+    branch per phrase at every position; sharing prefixes cuts that to
+    roughly one branch per distinct next character.
+    """
+    trie: Dict[str, Dict] = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class _LiteralIndex:
+    """
+    Finds every literal (non-regex) marker phrase in one pass over the text.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, and
+    otherwise a few combined trie alternations. Phrases that are prefixes of
+    one another go in separate alternations, since an alternation reports at
+    most one phrase per start position. Both scan the lowercased text, and
+    hits are filtered to reproduce the ``\\b<phrase>\\b`` IGNORECASE
+    patterns they replace, including finditer's non-overlapping matches per
+    phrase.
+    """
+
+    def __init__(self, literals: Dict[str, List[Tuple[str, int]]]):
+        """
+        Args:
+            literals: lowercased phrase -> [(marker_id, index into that
+                      marker's compiled pattern list)]
+        """
+        self.keys = {key for owners in literals.values() for key in owners}
+        self._owners = {phrase: tuple(owners) for phrase, owners in literals.items()}
+
+        # First character -> keys, probed with IGNORECASE so the regex
+        # engine's own case folding decides presence (see ruled_out)
+        by_first_char: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        for phrase, owners in literals.items():
+            by_first_char[phrase[0]].extend(owners)
+        self._first_char_probes = [(re.compile(re.escape(ch), re.IGNORECASE), tuple(keys))
+                                   for ch, keys in by_first_char.items()]
+
+        if HAS_AHOCORASICK:
+            self._automaton = ahocorasick.Automaton()
+            for phrase in literals:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+            self._alternations = []
+        else:
+            self._automaton = None
+            groups: List[List[str]] = []
+            # Longest first, so each phrase only needs checking against
+            # longer ones already placed
+            for phrase in sorted(literals, key=len, reverse=True):
+                for group in groups:
+                    if not any(other.startswith(phrase) for other in group):
+                        group.append(phrase)
+                        break
+                else:
+                    groups.append([phrase])
+            # The lookahead tests every position, so overlapping hits of
+            # different phrases are all reported
+            self._alternations = [re.compile(rf'(?=\b({_trie_alternation(group)})\b)')
+                                  for group in groups]
+
+    def _find(self, text_lower: str):
+        """Yield (start, phrase) candidates, in start order for any one phrase."""
+        if self._automaton is not None:
+            for end, phrase in self._automaton.iter(text_lower):
+                yield end + 1 - len(phrase), phrase
+        else:
+            for pattern in self._alternations:
+                for m in pattern.finditer(text_lower):
+                    yield m.start(), m.group(1)
+
+    def ruled_out(self, text: str) -> Set[Tuple[str, int]]:
+        """
+        Keys whose phrase cannot occur in text, because no character of the
+        text matches the phrase's first character.
+
+        For callers falling back to per-pattern regexes when scan() returns
+        None; one probe per distinct first character replaces running every
+        phrase regex that starts with it.
+        """
+        absent: Set[Tuple[str, int]] = set()
+        for probe, keys in self._first_char_probes:
+            if probe.search(text) is None:
+                absent.update(keys)
+        return absent
+
+    def scan(self, text: str) -> Optional[Dict[Tuple[str, int], List[Tuple[int, str]]]]:
+        """
+        Find literal phrase matches in text.
+
+        Returns:
+            (marker_id, pattern_index) -> [(position, matched_text)], or None
+            when lowercasing changes the text length (offsets would drift),
+            in which case the caller should use the regex patterns instead
+        """
+        text_lower = text.lower()
+        if len(text_lower) != len(text):
+            return None
+
+        hits: Dict[Tuple[str, int], List[Tuple[int, str]]] = defaultdict(list)
+        next_start: Dict[str, int] = {}
+        for start, phrase in self._find(text_lower):
+            end = start + len(phrase)
+            if start < next_start.get(phrase, 0):
+                continue
+            if not (_at_word_boundary(text, start) and _at_word_boundary(text, end)):
+                continue
+            next_start[phrase] = end
+            matched = text[start:end]
+            for key in self._owners[phrase]:
+                hits[key].append((start, matched))
+        return hits
     
 
 class MarkerLoader:
@@ -63,6 +245,8 @@ class MarkerLoader:
         self._loaded_markers: Optional[LoadedMarkers] = None
         self._context_profile: Optional[Dict] = None
         self._assignment_profile: Optional[Dict] = None
+        # (profile_id, context_profile) -> (markers, context profile, assignment profile)
+        self._load_cache: Dict[Tuple[str, str], Tuple[LoadedMarkers, Optional[Dict], Optional[Dict]]] = {}
         
     def _get_default_config_dir(self) -> Path:
         """Get the default configuration directory.
@@ -99,6 +283,11 @@ class MarkerLoader:
                          context_profile: str = "community_college") -> LoadedMarkers:
         """
         Load all markers with profile and context adjustments.
+
+        The YAML files are read once per (profile_id, context_profile);
+        later calls with the same arguments return the cached result.
+        Marker ids and confidence levels are interned so the per-match
+        dict/set lookups in scoring hit on identity.
         
         Args:
             profile_id: Assignment profile to use
@@ -109,6 +298,12 @@ class MarkerLoader:
         """
         if not HAS_YAML:
             raise ImportError("PyYAML is required for YAML marker loading")
+
+        cache_key = (profile_id, context_profile)
+        cached = self._load_cache.get(cache_key)
+        if cached is not None:
+            self._loaded_markers, self._context_profile, self._assignment_profile = cached
+            return self._loaded_markers
         
         # Load context profile
         self._load_context_profile(context_profile)
@@ -124,10 +319,9 @@ class MarkerLoader:
                 if yaml_file.name == "marker_manifest.yaml":
                     continue
                 try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        marker_data = yaml.safe_load(f)
-                        marker_id = marker_data.get('metadata', {}).get('marker_id', yaml_file.stem)
-                        markers[marker_id] = marker_data
+                    marker_data = _load_yaml(yaml_file)
+                    marker_id = marker_data.get('metadata', {}).get('marker_id', yaml_file.stem)
+                    markers[_intern(marker_id)] = marker_data
                 except Exception as e:
                     print(f"Warning: Could not load marker {yaml_file.name}: {e}")
         
@@ -136,24 +330,29 @@ class MarkerLoader:
         if custom_dir.exists():
             for yaml_file in custom_dir.glob("*.yaml"):
                 try:
-                    with open(yaml_file, 'r', encoding='utf-8') as f:
-                        marker_data = yaml.safe_load(f)
-                        marker_id = marker_data.get('metadata', {}).get('marker_id', yaml_file.stem)
-                        markers[marker_id] = marker_data
+                    marker_data = _load_yaml(yaml_file)
+                    marker_id = marker_data.get('metadata', {}).get('marker_id', yaml_file.stem)
+                    markers[_intern(marker_id)] = marker_data
                 except Exception as e:
                     print(f"Warning: Could not load custom marker {yaml_file.name}: {e}")
         
         # Apply adjustments and compile patterns
         context_multipliers = self._get_context_multipliers(markers)
         profile_multipliers = self._get_profile_multipliers(markers)
-        compiled_patterns = self._compile_patterns(markers, context_multipliers, profile_multipliers)
+        literals: Dict[str, List[Tuple[str, int]]] = {}
+        compiled_patterns = self._compile_patterns(markers, context_multipliers, profile_multipliers,
+                                                   literals)
         
         self._loaded_markers = LoadedMarkers(
             markers=markers,
             compiled_patterns=compiled_patterns,
             context_multipliers=context_multipliers,
-            profile_multipliers=profile_multipliers
+            profile_multipliers=profile_multipliers,
+            literal_index=_LiteralIndex(literals) if literals else None,
+            clustering=self._get_clustering(markers)
         )
+        self._load_cache[cache_key] = (self._loaded_markers, self._context_profile,
+                                       self._assignment_profile)
         
         return self._loaded_markers
     
@@ -162,8 +361,7 @@ class MarkerLoader:
         profile_path = self.context_dir / f"{profile_id}.yaml"
         if profile_path.exists():
             try:
-                with open(profile_path, 'r', encoding='utf-8') as f:
-                    self._context_profile = yaml.safe_load(f)
+                self._context_profile = _load_yaml(profile_path)
             except Exception as e:
                 print(f"Warning: Could not load context profile: {e}")
                 self._context_profile = None
@@ -173,12 +371,19 @@ class MarkerLoader:
         profile_path = self.profiles_dir / f"{profile_id}.yaml"
         if profile_path.exists():
             try:
-                with open(profile_path, 'r', encoding='utf-8') as f:
-                    self._assignment_profile = yaml.safe_load(f)
+                self._assignment_profile = _load_yaml(profile_path)
             except Exception as e:
                 print(f"Warning: Could not load assignment profile: {e}")
                 self._assignment_profile = None
     
+    def _get_clustering(self, markers: Dict) -> Dict[str, Tuple[int, float]]:
+        """Flatten each suspicious marker's clustering config to (threshold, boost)."""
+        clustering = {}
+        for marker_id in _SUSPICIOUS_MARKERS:
+            config = markers.get(marker_id, {}).get('clustering') or {}
+            clustering[marker_id] = (config.get('threshold', 3), config.get('weight_boost', 2.0))
+        return clustering
+
     def _get_context_multipliers(self, markers: Dict) -> Dict[str, float]:
         """Get context-based weight multipliers."""
         multipliers = {}
@@ -210,8 +415,15 @@ class MarkerLoader:
     def _compile_patterns(self, 
                           markers: Dict,
                           context_mult: Dict[str, float],
-                          profile_mult: Dict[str, float]) -> Dict[str, List[Tuple[re.Pattern, float, str]]]:
-        """Compile regex patterns with adjusted weights."""
+                          profile_mult: Dict[str, float],
+                          literals: Optional[Dict[str, List[Tuple[str, int]]]] = None
+                          ) -> Dict[str, List[Tuple[re.Pattern, float, str]]]:
+        """
+        Compile regex patterns with adjusted weights.
+
+        If ``literals`` is given, each non-regex phrase is also recorded there
+        as lowercased phrase -> [(marker_id, pattern_index)] for _LiteralIndex.
+        """
         compiled = {}
         
         for marker_id, marker_data in markers.items():
@@ -224,6 +436,7 @@ class MarkerLoader:
             # Process each marker section
             marker_section = marker_data.get('markers', {})
             for confidence_level, items in marker_section.items():
+                confidence_level = _intern(confidence_level)
                 if not isinstance(items, list):
                     if isinstance(items, dict) and 'patterns' in items:
                         items = items['patterns']
@@ -254,6 +467,9 @@ class MarkerLoader:
                             # Escape and create word-boundary pattern
                             escaped = re.escape(pattern_str)
                             regex = re.compile(rf'\b{escaped}\b', re.IGNORECASE)
+                            phrase = pattern_str.lower()
+                            if literals is not None and len(phrase) == len(pattern_str):
+                                literals.setdefault(phrase, []).append((marker_id, len(patterns)))
                         
                         patterns.append((regex, adjusted_weight, confidence_level))
                     except re.error as e:
@@ -275,16 +491,24 @@ class MarkerLoader:
             return []
         
         matches = []
-        text_lower = text.lower()
+        literal_index = self._loaded_markers.literal_index
+        literal_hits = literal_index.scan(text) if literal_index else None
+        ruled_out = literal_index.ruled_out(text) if literal_index and literal_hits is None else ()
         
         for marker_id, patterns in self._loaded_markers.compiled_patterns.items():
-            for regex, weight, confidence in patterns:
-                for match in regex.finditer(text):
+            for i, (regex, weight, confidence) in enumerate(patterns):
+                if literal_hits is not None and (marker_id, i) in literal_index.keys:
+                    found = literal_hits.get((marker_id, i), ())
+                elif (marker_id, i) in ruled_out:
+                    continue
+                else:
+                    found = ((m.start(), m.group()) for m in regex.finditer(text))
+                for position, matched_text in found:
                     matches.append(MarkerMatch(
                         marker_id=marker_id,
                         pattern=regex.pattern,
-                        matched_text=match.group(),
-                        position=match.start(),
+                        matched_text=matched_text,
+                        position=position,
                         weight=weight,
                         confidence=confidence
                     ))
@@ -310,19 +534,6 @@ class MarkerLoader:
         details = {}
         transparency_flags = []  # What was flagged for instructor review
 
-        # Categorize markers
-        # AI-SPECIFIC markers - NEVER receive cognitive protection
-        ai_specific_markers = {'ai_specific_organization'}
-
-        # OVERLAPPING markers - subject to cognitive protection when neurodivergent patterns present
-        overlapping_organizational_markers = {'ai_transitions', 'generic_phrases', 'hedge_phrases', 'inflated_vocabulary'}
-
-        # All suspicious markers (for scoring)
-        suspicious_markers = ai_specific_markers | overlapping_organizational_markers
-
-        # Authenticity markers (presence is good)
-        authenticity_markers = {'personal_voice_markers', 'balance_markers', 'emotional_language', 'cognitive_diversity_markers'}
-
         # First pass: count all markers
         for match in matches:
             if match.marker_id not in marker_counts:
@@ -363,7 +574,7 @@ class MarkerLoader:
             weight = match.weight
 
             # Apply cognitive diversity protection ONLY to overlapping markers, NOT AI-specific
-            if cognitive_protection_active and match.marker_id in overlapping_organizational_markers:
+            if cognitive_protection_active and match.marker_id in _OVERLAPPING_ORGANIZATIONAL_MARKERS:
                 weight = weight * cognitive_protection_multiplier
 
             # AI-specific markers NEVER get protection
@@ -372,23 +583,20 @@ class MarkerLoader:
             details[match.marker_id]['total_weight'] += weight
 
             # Add to appropriate score
-            if match.marker_id in suspicious_markers:
+            if match.marker_id in _SUSPICIOUS_MARKERS:
                 suspicious_score += weight
-            elif match.marker_id in authenticity_markers:
+            elif match.marker_id in _AUTHENTICITY_MARKERS:
                 # Negative weights boost authenticity
                 authenticity_score += abs(weight)
 
         # Apply clustering bonuses (also subject to cognitive protection)
         for marker_id, count in marker_counts.items():
-            if count >= 3 and marker_id in suspicious_markers:
-                marker_config = self._loaded_markers.markers.get(marker_id, {})
-                clustering = marker_config.get('clustering', {})
-                threshold = clustering.get('threshold', 3)
-                boost = clustering.get('weight_boost', 2.0)
+            if count >= 3 and marker_id in _SUSPICIOUS_MARKERS:
+                threshold, boost = self._loaded_markers.clustering[marker_id]
 
                 if count >= threshold:
                     # Apply cognitive protection to clustering bonus for OVERLAPPING markers only
-                    if cognitive_protection_active and marker_id in overlapping_organizational_markers:
+                    if cognitive_protection_active and marker_id in _OVERLAPPING_ORGANIZATIONAL_MARKERS:
                         boost = boost * cognitive_protection_multiplier
                     # AI-specific markers keep full clustering bonus (no protection)
 
@@ -479,6 +687,22 @@ class MarkerLoader:
         }
 
 
+@lru_cache(maxsize=4)
+def _shared_marker_loader(config_dir: Optional[str]) -> "MarkerLoader":
+    return MarkerLoader(Path(config_dir) if config_dir else None)
+
+
+def get_shared_marker_loader(config_dir: Optional[Path] = None) -> MarkerLoader:
+    """
+    Get the process-wide MarkerLoader for a config directory.
+
+    Batch grading builds a detector per submission; sharing the loader means
+    the YAML is parsed and the patterns compiled once per process instead.
+    Callers must treat the returned LoadedMarkers as read-only.
+    """
+    return _shared_marker_loader(str(Path(config_dir).resolve()) if config_dir else None)
+
+
 def load_markers(config_dir: Optional[Path] = None,
                  profile_id: str = "standard",
                  context_profile: str = "community_college") -> Optional[LoadedMarkers]:
@@ -491,5 +715,5 @@ def load_markers(config_dir: Optional[Path] = None,
     if not HAS_YAML:
         return None
     
-    loader = MarkerLoader(config_dir)
+    loader = get_shared_marker_loader(config_dir)
     return loader.load_all_markers(profile_id, context_profile)
@@ -172,9 +172,9 @@ class Translator:
             r = requests.get(f"{self.base_url}/api/tags", timeout=5)
             if r.status_code == 200:
                 models = [m["name"] for m in r.json().get("models", [])]
+                family = self.model.partition(":")[0]
                 self._ollama_available = any(
-                    m == self.model or m.startswith(self.model.split(":")[0])
-                    for m in models
+                    m == self.model or m.startswith(family) for m in models
                 )
                 if not self._ollama_available:
                     logger.warning(
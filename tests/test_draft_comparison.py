@@ -0,0 +1,231 @@
+"""
+draft_comparison.py — unit tests.
+
+Tests `DraftComparisonAnalyzer` verdicts on synthetic draft/final pairs,
+pins the paragraph-matching shortcuts in `_identify_major_changes` against
+the plain all-pairs SequenceMatcher comparison they replace, and checks
+`_count_word_changes` against SequenceMatcher's 'replace' opcodes.
+
+The concern thresholds were calibrated against difflib's Ratcliff-Obershelp
+ratio; other similarity scorers (InDel, Levenshtein) give different numbers
+and verdicts for the same texts.
+
+All pure computation — no LLM, no DB.
+
+Run with: python -m pytest tests/test_draft_comparison.py -v
+"""
+
+import os
+import random
+import sys
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+
+from modules.draft_comparison import DraftComparisonAnalyzer
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus — no real student data
+# ---------------------------------------------------------------------------
+
+DRAFT_ESSAY = """\
+I think the reading about redlining made me see my neighborhood differently.
+My grandma always said the freeway split the old blocks in half.
+
+At first I didn't get why the maps mattered so much. The red areas were
+where Black families lived and banks wouldn't give them loans.
+
+Then I looked up my own street on the map and it was marked yellow, which
+means declining. That surprised me because my family has been here forever.
+
+I want to ask my grandma more about what it was like before the freeway.
+She remembers the corner store and the church that got torn down.
+
+So I guess my point is that the maps are not just history, they still
+shape where people live and who owns houses today."""
+
+# Same topic, completely rewritten in a different register.
+UNRELATED_FINAL = """\
+Residential security maps produced by the Home Owners' Loan Corporation
+codified racialized appraisal practices across American municipalities.
+
+Contemporary econometric analyses demonstrate persistent disparities in
+homeownership, assessed valuation, and intergenerational wealth transfer.
+
+Infrastructure siting decisions, particularly interstate construction,
+disproportionately displaced communities designated hazardous.
+
+Scholarship therefore situates present segregation within deliberate
+federal policy rather than aggregate individual preference.
+
+Consequently, remediation requires structural intervention: targeted
+investment, reparative lending, and equitable zoning reform."""
+
+# Genuine revision: the draft's paragraphs survive with edits and one is added.
+REVISED_FINAL = """\
+I think the reading about redlining made me see my neighborhood differently.
+My grandma always said the freeway split the old blocks right in half.
+
+At first I didn't understand why the maps mattered so much. The red areas
+were where Black families lived, and banks refused to give them loans.
+
+Then I looked up my own street on the map and it was marked yellow, which
+means "declining." That surprised me because my family has lived here forever.
+
+I asked my grandma what it was like before the freeway. She remembers the
+corner store and the church that got torn down, and she still misses them.
+
+So my point is that the maps are not just history. They still shape where
+people live and who gets to own a house today.
+
+Next I want to find out whether the freeway route was chosen on purpose."""
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return DraftComparisonAnalyzer()
+
+
+def _reference_major_changes(paras1, paras2):
+    """All-pairs formulation: a paragraph is matched when its best ratio
+    against the other side reaches 0.3, always scoring (draft, final)."""
+    changes = []
+    for i, p1 in enumerate(paras1):
+        best = max((SequenceMatcher(None, p1.lower(), p2.lower()).ratio()
+                    for p2 in paras2), default=0)
+        if best < 0.3:
+            preview = p1[:50] + "..." if len(p1) > 50 else p1
+            changes.append(f"Draft paragraph {i+1} removed or heavily rewritten: '{preview}'")
+    for i, p2 in enumerate(paras2):
+        best = max((SequenceMatcher(None, p1.lower(), p2.lower()).ratio()
+                    for p1 in paras1), default=0)
+        if best < 0.3:
+            preview = p2[:50] + "..." if len(p2) > 50 else p2
+            changes.append(f"New paragraph {i+1} in final: '{preview}'")
+    return changes
+
+
+def _random_paragraph_pairs(seed, count):
+    """Yield (draft_paras, final_paras) built from a small shared vocabulary
+    so many pairs land near the 0.3 threshold."""
+    rng = random.Random(seed)
+    vocab = ("the of and a to in is was student argue essay power history "
+             "we they that this not but because theory").split()
+
+    def para():
+        return " ".join(rng.choice(vocab) for _ in range(rng.randint(3, 40)))
+
+    def mutate(p):
+        words = p.split()
+        for _ in range(rng.randint(0, len(words))):
+            op = rng.random()
+            if op < 0.4 and words:
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            elif op < 0.7:
+                words.insert(rng.randint(0, len(words)), rng.choice(vocab))
+            elif words:
+                del words[rng.randrange(len(words))]
+        return " ".join(words) or "x"
+
+    for _ in range(count):
+        draft = [para() for _ in range(rng.randint(1, 6))]
+        final = [mutate(p) if rng.random() < 0.7 else para() for p in draft]
+        if rng.random() < 0.3:
+            rng.shuffle(final)
+        yield draft, final
+
+
+# ---------------------------------------------------------------------------
+# Verdicts
+# ---------------------------------------------------------------------------
+
+class TestVerdicts:
+    def test_unrelated_rewrite_is_high_concern(self, analyzer):
+        result = analyzer.compare_submissions(DRAFT_ESSAY, UNRELATED_FINAL)
+        assert result.overall_similarity < 0.2
+        assert result.concern_level == "high"
+        assert "Draft content mostly replaced (< 30% preserved)" in result.concern_reasons
+
+    def test_unrelated_rewrite_major_changes(self, analyzer):
+        result = analyzer.compare_submissions(DRAFT_ESSAY, UNRELATED_FINAL)
+        # Character-level ratios between unrelated English paragraphs sit
+        # just either side of 0.3, so only some pairs are flagged; the list
+        # is truncated to the top 5.
+        assert result.major_changes == [
+            "Draft paragraph 1 removed or heavily rewritten: 'I think the reading about redlining made me see my...'",
+            "Draft paragraph 3 removed or heavily rewritten: 'Then I looked up my own street on the map and it w...'",
+            "Draft paragraph 5 removed or heavily rewritten: 'So I guess my point is that the maps are not just ...'",
+            "New paragraph 1 in final: 'Residential security maps produced by the Home Own...'",
+            "New paragraph 2 in final: 'Contemporary econometric analyses demonstrate pers...'",
+        ]
+
+    def test_genuine_revision_is_not_flagged(self, analyzer):
+        result = analyzer.compare_submissions(DRAFT_ESSAY, REVISED_FINAL)
+        assert result.concern_level == "none"
+        assert result.concern_reasons == []
+        assert result.major_changes == []
+
+    def test_resubmitted_draft(self, analyzer):
+        result = analyzer.compare_submissions(DRAFT_ESSAY, DRAFT_ESSAY)
+        assert result.overall_similarity == 1.0
+        assert result.major_changes == []
+        assert result.concern_level == "elevated"
+        assert result.concern_reasons == ["Draft and final nearly identical (> 95% similar)"]
+
+
+# ---------------------------------------------------------------------------
+# _identify_major_changes — shortcuts must not change which pairs match
+# ---------------------------------------------------------------------------
+
+class TestIdentifyMajorChanges:
+    def test_matches_all_pairs_reference_on_essays(self, analyzer):
+        for final in (UNRELATED_FINAL, REVISED_FINAL, DRAFT_ESSAY):
+            draft_paras = analyzer._get_paragraphs(DRAFT_ESSAY)
+            final_paras = analyzer._get_paragraphs(final)
+            assert (analyzer._identify_major_changes(draft_paras, final_paras)
+                    == _reference_major_changes(draft_paras, final_paras))
+
+    def test_matches_all_pairs_reference_near_threshold(self, analyzer):
+        for draft, final in _random_paragraph_pairs(seed=7, count=60):
+            assert (analyzer._identify_major_changes(draft, final)
+                    == _reference_major_changes(draft, final))
+
+    def test_empty_side(self, analyzer):
+        assert analyzer._identify_major_changes([], ["New text here."]) == [
+            "New paragraph 1 in final: 'New text here.'"
+        ]
+        assert analyzer._identify_major_changes([], []) == []
+
+
+# ---------------------------------------------------------------------------
+# _count_word_changes — replace counts follow SequenceMatcher's opcodes
+# ---------------------------------------------------------------------------
+
+class TestCountWordChanges:
+    def test_single_substitution(self, analyzer):
+        draft = "the maps are not just history".split()
+        final = "the maps are not only history".split()
+        assert analyzer._count_word_changes(draft, final) == (1, 1, 1)
+
+    def test_pure_insertion_is_not_a_change(self, analyzer):
+        draft = "the maps still matter".split()
+        final = "the old maps still matter today".split()
+        assert analyzer._count_word_changes(draft, final) == (2, 0, 0)
+
+    def test_matches_sequencematcher_replace_counts(self, analyzer):
+        for draft, final in _random_paragraph_pairs(seed=11, count=200):
+            words1 = " ".join(draft).split()
+            words2 = " ".join(final).split()
+            expected_changed = sum(
+                max(i2 - i1, j2 - j1)
+                for tag, i1, i2, j1, j2
+                in SequenceMatcher(None, words1, words2).get_opcodes()
+                if tag == 'replace'
+            )
+            added, removed, changed = analyzer._count_word_changes(words1, words2)
+            assert changed == expected_changed
+            assert added == len(set(words2) - set(words1))
+            assert removed == len(set(words1) - set(words2))
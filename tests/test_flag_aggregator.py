@@ -0,0 +1,216 @@
+"""
+flag_aggregator.py — unit tests.
+
+Tests the save/load round trip of the persistent flag log with both
+workbook writers (openpyxl write-only and XlsxWriter), and the overflow
+path: a details log longer than AUTOGRADER_MAX_EXCEL_ROWS goes to a CSV
+beside the workbook, is read back in preference to the Details sheet, and
+the CSV is removed once the log fits in the workbook again. A write that
+fails partway must leave the previously saved log readable.
+
+Writes only to pytest's tmp_path — no Canvas, no real student data.
+
+Run with: python -m pytest tests/test_flag_aggregator.py -v
+"""
+
+import importlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+from automation import flag_aggregator
+
+
+def _adc_results(count, course="Ethnic Studies 101"):
+    """ADC result dicts for `count` flagged submissions across 3 students."""
+    levels = ["High", "Moderate", "Very High", "Elevated"]
+    return [
+        {
+            "student_id": 1000 + i % 3,
+            "student_name": f"Student {i % 3}",
+            "course_name": course,
+            "assignment_name": f"Reflection {i}",
+            "concern_level": levels[i % len(levels)],
+            "suspicious_score": 1.5 + i,
+            "authenticity_score": 0.25 * i,
+            "ai_transition_count": i % 2,
+            "context_adjustments": "ESL" if i % 2 else "",
+        }
+        for i in range(count)
+    ]
+
+
+def _comparable(details):
+    """Detail records as sorted tuples of plain values, blanks as ''."""
+    return sorted(
+        tuple("" if row.get(col) is None else str(row.get(col))
+              for col in flag_aggregator.DETAIL_COLUMNS)
+        for row in details
+    )
+
+
+@pytest.fixture(params=["openpyxl", "xlsxwriter"])
+def module(request, monkeypatch):
+    """flag_aggregator reloaded with a 4-row Excel limit and the given writer."""
+    monkeypatch.setenv("AUTOGRADER_MAX_EXCEL_ROWS", "4")
+    module = importlib.reload(flag_aggregator)
+    if request.param == "xlsxwriter":
+        pytest.importorskip("xlsxwriter")
+        monkeypatch.setattr(module, "HAS_XLSXWRITER", True)
+    else:
+        monkeypatch.setattr(module, "HAS_XLSXWRITER", False)
+    yield module
+    monkeypatch.undo()
+    importlib.reload(flag_aggregator)
+
+
+@pytest.fixture
+def excel_path(tmp_path):
+    return tmp_path / "flags" / "flag_log.xlsx"
+
+
+class TestWorkbookRoundTrip:
+    def test_reload_restores_summary_and_details(self, module, excel_path):
+        assert module.MAX_EXCEL_ROWS == 4
+        agg = module.FlagAggregator(str(excel_path))
+        agg.add_flags(_adc_results(3))
+        agg.save()
+
+        assert excel_path.exists()
+        assert not agg.details_csv_path.exists()
+
+        reloaded = module.FlagAggregator(str(excel_path))
+        assert _comparable(reloaded.details) == _comparable(agg.details)
+        assert set(reloaded.summary) == set(agg.summary)
+        for student_id, entry in agg.summary.items():
+            assert reloaded.summary[student_id]["Total Flags"] == entry["Total Flags"]
+            assert reloaded.summary[student_id]["Courses"] == entry["Courses"]
+
+    def test_reloaded_detail_columns_are_interned(self, module, excel_path):
+        agg = module.FlagAggregator(str(excel_path))
+        agg.add_flags(_adc_results(3))
+        agg.save()
+
+        reloaded = module.FlagAggregator(str(excel_path))
+        first, second = reloaded.details[0], reloaded.details[1]
+        assert first["Course"] is second["Course"]
+        assert first["Flag Date"] is second["Flag Date"]
+
+    def test_blank_total_flags_cell_is_tolerated(self, module, excel_path):
+        from openpyxl import load_workbook
+
+        agg = module.FlagAggregator(str(excel_path))
+        agg.add_flags(_adc_results(3))
+        agg.save()
+
+        # Clear one student's count and hand-edit another's, as in Excel
+        wb = load_workbook(excel_path)
+        wb["Summary"]["C2"] = None
+        wb["Summary"]["C3"] = "two"
+        wb.save(excel_path)
+
+        reloaded = module.FlagAggregator(str(excel_path))
+        counts = sorted(e["Total Flags"] for e in reloaded.summary.values())
+        assert counts == [0, 0, 1]
+
+        reloaded.add_flags(_adc_results(3))
+        reloaded.save()
+        resaved = module.FlagAggregator(str(excel_path))
+        assert sorted(e["Total Flags"] for e in resaved.summary.values()) == [1, 1, 2]
+
+    def test_low_concern_results_are_not_logged(self, module, excel_path):
+        agg = module.FlagAggregator(str(excel_path))
+        agg.add_flags([dict(r, concern_level="Low") for r in _adc_results(3)])
+        assert agg.details == []
+        assert agg.summary == {}
+
+
+class _FailingRow(dict):
+    """Detail row whose 'Context' cell raises while the sheet is written."""
+
+    def get(self, key, default=None):
+        if key == "Context":
+            raise RuntimeError("simulated write failure")
+        return super().get(key, default)
+
+
+class TestFailedWrite:
+    # The abandoned workbook objects complain when garbage-collected
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+    def test_failed_workbook_write_keeps_existing_log(self, module, excel_path):
+        agg = module.FlagAggregator(str(excel_path))
+        agg.add_flags(_adc_results(3))
+        agg.save()
+        saved = _comparable(agg.details)
+
+        # A row that fails as the first Details row (newest date sorts first)
+        agg.details.append(_FailingRow(agg.details[0], **{"Flag Date": "9999-12-31"}))
+        agg.save()
+
+        assert not excel_path.with_name("flag_log.tmp.xlsx").exists()
+        reloaded = module.FlagAggregator(str(excel_path))
+        assert _comparable(reloaded.details) == saved
+
+
+class TestOverflowCsv:
+    def test_save_reload_resave(self, module, excel_path, monkeypatch):
+        # 1. More details than the limit: CSV written, Details sheet empty
+        agg = module.FlagAggregator(str(excel_path))
+        agg.add_flags(_adc_results(6))
+        agg.save()
+
+        csv_path = agg.details_csv_path
+        assert csv_path.exists()
+        assert pd.read_excel(excel_path, sheet_name="Details").empty
+        assert len(pd.read_excel(excel_path, sheet_name="Summary")) == 3
+
+        # 2. Reload reads the CSV, not the (empty) Details sheet
+        reloaded = module.FlagAggregator(str(excel_path))
+        assert _comparable(reloaded.details) == _comparable(agg.details)
+
+        # New flags append to the CSV-backed log on the next save
+        reloaded.add_flags(_adc_results(1, course="Sociology 5"))
+        reloaded.save()
+        assert len(pd.read_csv(csv_path)) == 7
+
+        # 3. Once the log fits again, details move back into the workbook
+        #    and the CSV is removed
+        monkeypatch.setattr(module, "MAX_EXCEL_ROWS", 100)
+        resaved = module.FlagAggregator(str(excel_path))
+        resaved.save()
+        assert not csv_path.exists()
+        assert len(pd.read_excel(excel_path, sheet_name="Details")) == 7
+
+        final = module.FlagAggregator(str(excel_path))
+        assert _comparable(final.details) == _comparable(resaved.details)
+        assert len(final.details) == 7
+
+    def test_failed_csv_write_keeps_details(self, module, excel_path, monkeypatch):
+        # Details that fit are saved in the workbook
+        agg = module.FlagAggregator(str(excel_path))
+        agg.add_flags(_adc_results(3))
+        agg.save()
+        saved = _comparable(agg.details)
+
+        # The first overflow save fails while writing the CSV (disk full)
+        def disk_full(*args, **kwargs):
+            raise OSError(28, "No space left on device")
+
+        agg.add_flags(_adc_results(3, course="Sociology 5"))
+        with monkeypatch.context() as m:
+            m.setattr(module.csv, "writer", disk_full)
+            agg.save()
+
+        csv_path = agg.details_csv_path
+        assert not csv_path.exists()
+        assert not csv_path.with_name("flag_log_details.tmp.csv").exists()
+
+        # The workbook was left alone, so the saved details are still there
+        reloaded = module.FlagAggregator(str(excel_path))
+        assert _comparable(reloaded.details) == saved
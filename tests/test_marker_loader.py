@@ -0,0 +1,181 @@
+"""
+marker_loader.py — unit tests.
+
+Tests that `_LiteralIndex.scan` reports exactly what the per-phrase
+`\\b<phrase>\\b` IGNORECASE regexes it replaces would find, on both the
+pyahocorasick and the trie-alternation backends, and that `ruled_out`
+never rules out a phrase the regex would match.
+
+All pure computation — no YAML files, no LLM.
+
+Run with: python -m pytest tests/test_marker_loader.py -v
+"""
+
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+
+from modules import marker_loader
+from modules.marker_loader import _LiteralIndex
+
+
+# ---------------------------------------------------------------------------
+# Phrases and texts
+# ---------------------------------------------------------------------------
+
+PHRASES = [
+    # Prefixes of one another
+    "in", "in fact", "in fact it", "it is", "it is important",
+    # Overlapping with each other and with themselves
+    "a lot", "lot of", "ha ha",
+    # Punctuation at the edges or inside
+    "e.g.", "u.s.", "(see", "--", "self-aware", "'tis", "ok!",
+    # Word characters regex treats specially
+    "snake_case", "covid-19", "naïve", "café",
+]
+
+TEXTS = [
+    "In fact it is important to note that, in fact, it is.",
+    "IN FACT IT IS IMPORTANT",
+    "infact in-fact in_fact fin fact",
+    "ha ha ha ha",
+    "A lot of people say a lot. A LOT OF THEM.",
+    "Some examples, e.g. apples, e.g.pears, and the U.S. economy.",
+    "The u.s.a. is not the u.s. (see below) (see, also (seen",
+    "wait -- what---no --",
+    "I am self-aware, self-awareness, and self-aware_ly so.",
+    "'Tis the season; 'tisn't; it'tis.",
+    "ok! ok!? ok!ok! OK!",
+    "snake_case vs snake_cases and _snake_case",
+    "covid-19 COVID-19 covid-190 xcovid-19",
+    "Naïve NAÏVE naïveté café CAFÉ cafés",
+    "",
+    "in",
+]
+
+
+def _literals(phrases):
+    """lowercased phrase -> [(marker_id, index)], as _compile_patterns builds it."""
+    literals = {}
+    for i, phrase in enumerate(phrases):
+        literals.setdefault(phrase.lower(), []).append((f"marker_{i % 3}", i))
+    # A phrase shared by two markers reports the hit under both keys
+    literals["in fact"].append(("marker_shared", 99))
+    return literals
+
+
+def _regex_hits(literals, text):
+    """What the per-phrase word-boundary regexes find, keyed like scan()."""
+    hits = {}
+    for phrase, owners in literals.items():
+        found = [(m.start(), m.group())
+                 for m in re.finditer(rf"\b{re.escape(phrase)}\b", text, re.I)]
+        if found:
+            for key in owners:
+                hits[key] = found
+    return hits
+
+
+def _random_texts(seed, count):
+    """Texts stitched from phrases, near-misses and separators in mixed case."""
+    rng = random.Random(seed)
+    pieces = PHRASES + ["fin", "facts", "lots", "see", "tis", "ok", "x", "_", "9"]
+    separators = [" ", "  ", ", ", ". ", "(", ")", "-", "\n", "_", "'", "!", ""]
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            piece = rng.choice(pieces)
+            case = rng.random()
+            if case < 0.2:
+                piece = piece.upper()
+            elif case < 0.4:
+                piece = piece.title()
+            parts.append(piece)
+            parts.append(rng.choice(separators))
+        yield "".join(parts)
+
+
+@pytest.fixture(params=["trie", "ahocorasick"])
+def backend(request, monkeypatch):
+    """Build indexes with the requested backend (read in __init__)."""
+    if request.param == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+        if not hasattr(marker_loader, "ahocorasick"):
+            pytest.skip("marker_loader was imported without pyahocorasick")
+        monkeypatch.setattr(marker_loader, "HAS_AHOCORASICK", True)
+    else:
+        monkeypatch.setattr(marker_loader, "HAS_AHOCORASICK", False)
+    return request.param
+
+
+@pytest.fixture
+def index(backend):
+    return _LiteralIndex(_literals(PHRASES))
+
+
+# ---------------------------------------------------------------------------
+# scan() matches the regexes it replaces
+# ---------------------------------------------------------------------------
+
+class TestScan:
+    def test_uses_requested_backend(self, index, backend):
+        if backend == "ahocorasick":
+            assert index._automaton is not None
+        else:
+            assert index._automaton is None
+            # "in", "in fact" and "in fact it" can't share an alternation
+            assert len(index._alternations) >= 3
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_matches_regex_on_fixed_texts(self, index, text):
+        literals = _literals(PHRASES)
+        assert dict(index.scan(text)) == _regex_hits(literals, text)
+
+    def test_matches_regex_on_random_texts(self, index):
+        literals = _literals(PHRASES)
+        for text in _random_texts(seed=3, count=400):
+            assert dict(index.scan(text)) == _regex_hits(literals, text), text
+
+    def test_prefix_phrases_all_reported(self, index):
+        hits = index.scan("In fact it rains.")
+        assert hits[("marker_0", 0)] == [(0, "In")]
+        assert hits[("marker_1", 1)] == [(0, "In fact")]
+        assert hits[("marker_shared", 99)] == [(0, "In fact")]
+        assert hits[("marker_2", 2)] == [(0, "In fact it")]
+
+    def test_self_overlap_is_non_overlapping(self, index):
+        # finditer reports "ha ha" at 0 and 6, not at 3
+        assert index.scan("ha ha ha ha")[("marker_1", 7)] == [(0, "ha ha"), (6, "ha ha")]
+
+    def test_punctuation_edges_follow_word_boundaries(self, index):
+        # \b after a trailing "." needs a word character next
+        hits = index.scan("e.g. apples, e.g.pears")
+        assert hits[("marker_2", 8)] == [(13, "e.g.")]
+
+    def test_lowercase_length_change_falls_back(self, index):
+        # "İ".lower() is two code points, so offsets would drift
+        text = "İstanbul, in fact"
+        assert len(text.lower()) != len(text)
+        assert index.scan(text) is None
+
+
+# ---------------------------------------------------------------------------
+# ruled_out() — only ever excludes phrases the regex can't match
+# ---------------------------------------------------------------------------
+
+class TestRuledOut:
+    def test_never_rules_out_a_match(self, index):
+        literals = _literals(PHRASES)
+        texts = TEXTS + ["İstanbul, in fact", "İ ok! (see"] + list(_random_texts(seed=5, count=200))
+        for text in texts:
+            assert not index.ruled_out(text) & _regex_hits(literals, text).keys(), text
+
+    def test_rules_out_absent_first_characters(self, index):
+        absent = index.ruled_out("İstanbul")
+        assert ("marker_1", 7) in absent      # "ha ha"
+        assert ("marker_0", 0) not in absent  # "in": İ folds to i
@@ -27,6 +27,7 @@ from insights.quick_analyzer import (
     _extract_key_concepts,
     _strip_html,
     _tokenize,
+    _tokenize_plain,
     match_submission_references,
 )
 from insights.models import AssignmentFingerprint, QuickAnalysisResult
@@ -135,6 +136,10 @@ class TestTokenize:
         assert "structural" in tokens
         assert "analysis" in tokens
 
+    def test_plain_matches_tokenize_on_stripped_text(self):
+        html = "<p>Crenshaw argues <b>that</b> intersectionality matters</p>"
+        assert _tokenize_plain(_strip_html(html)) == _tokenize(html)
+
     def test_empty_string(self):
         assert _tokenize("") == []
 